@@ -3,18 +3,19 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 import pandas as pd
 import streamlit as st
 import altair as alt
+import tracemalloc
 from datetime import date, timedelta
-from itertools import combinations
 
-from trader.io.store import load_raw
-from trader.signals.rsi import compute_rsi_signals
-from trader.signals.cci import compute_cci_signals
-from trader.signals.ott import compute_ott, signals_price_vs_ott
-from trader.signals.tma import compute_tma_series, signals_tma_order
+from trader.config import CHART_POINTS
+from trader.io.store import load_symbol, symbol_index, append_bars
+from trader.io.signal_store import load_signals
 from trader.signals.combine import combine
 from trader.backtest.engine import backtest_long_only
+from trader.backtest.rank import rank_combos
 from trader.backtest.metrics import metrics
 from trader.datasources.yfinance_source import fetch
+from trader.utils.timing import TRACER, stage, traced
+from trader.utils.downsample import downsample
 import warnings
 
 warnings.simplefilter("ignore")
@@ -22,6 +23,9 @@ os.makedirs("data/raw", exist_ok=True)
 
 st.set_page_config(page_title="Signals & Backtest", layout="wide")
 
+# her rerun kendi zamanlamasını (yalnızca bu oturumun thread'inde) toplar; panel sayfanın en altında
+timer = TRACER.bind(memory=st.session_state.get("trace_memory", False))
+
 st.markdown("""
 <style>
 .app-title {
@@ -80,8 +84,6 @@ st.markdown("""
 <div class="app-title">Backtesting <span>Trading Strategies</span></div>
 """, unsafe_allow_html=True)
 
-RAW_PATH = "data/raw/prices.parquet"
-
 def symbol_meta(symbol: str):
     s = symbol.upper()
     mapping = {
@@ -147,65 +149,33 @@ def normalize_initial_capital():
     value = parse_capital(st.session_state.get("init_capital_text", "10000"))
     st.session_state["init_capital_text"] = format_capital(value)
 
-def load_data():
-    df = load_raw().copy()
-    if not pd.api.types.is_datetime64_any_dtype(df["date"]):
-        df["date"] = pd.to_datetime(df["date"])
-    df = df.sort_values(["symbol", "date"]).reset_index(drop=True)
-    return df
-
 def fetch_and_append(yf_symbol: str, start_date: str):
-    df_old = load_raw()
     df_new = fetch([yf_symbol], start=start_date, interval="1d", adjust=True)
     if df_new.empty:
         return False
-    df_all = pd.concat([df_old, df_new], ignore_index=True)
-    df_all = df_all.drop_duplicates(subset=["date", "symbol"]).sort_values(["symbol", "date"]).reset_index(drop=True)
-    df_all.to_parquet(RAW_PATH)
+    append_bars(df_new)
     return True
 
-def refresh_symbol_data(symbol: str, df_all: pd.DataFrame):
-    df_symbol = df_all[df_all["symbol"] == symbol].copy()
-    if df_symbol.empty:
+@traced("app.refresh_symbol_data")
+def refresh_symbol_data(symbol: str, sym_index: pd.DataFrame):
+    row = sym_index[sym_index["symbol"] == symbol]
+    if row.empty:
         return False
-    latest_date = pd.to_datetime(df_symbol["date"]).max().date()
+    latest_date = pd.to_datetime(row["end"]).max().date()
     fetch_start = str(latest_date)
     return fetch_and_append(symbol, fetch_start)
 
-def build_signals(df: pd.DataFrame, rsi_n=14, rsi_ob=70, rsi_os=30, cci_n=20, cci_up=100, cci_lo=-100, ott_len=2, ott_pct=1.4, tma_f=5, tma_m=20, tma_s=50):
-    r, rb, rs = compute_rsi_signals(df["close"], n=rsi_n, ob=rsi_ob, os=rsi_os)
-    c, cb, cs = compute_cci_signals(df, n=cci_n, upper=cci_up, lower=cci_lo)
-    df2 = compute_ott(df.copy(), length=ott_len, percent=ott_pct, ma_type="EMA")
-    ob, os = signals_price_vs_ott(df2)
-    mf, mm, ms = compute_tma_series(df2["close"], fast=tma_f, mid=tma_m, slow=tma_s, ma_type="EMA")
-    tb, ts = signals_tma_order(mf, mm, ms)
-    sig_all = {"OTT": (ob, os), "TMA": (tb, ts), "CCI": (cb, cs), "RSI": (rb, rs)}
-    return df2, sig_all
-
-def rank_combos(df: pd.DataFrame, sig_all: dict, fee_bps: int):
-    all_models = ["OTT", "CCI", "TMA", "RSI"]
-    rows = []
-    for ksize in range(1, len(all_models) + 1):
-        for combo in combinations(all_models, ksize):
-            pick = {x.lower(): sig_all[x] for x in combo}
-            mode_specs = [("ANY", None), ("ALL", None)]
-            max_vote = min(3, len(combo))
-            for k_vote in range(2, max_vote + 1):
-                mode_specs.append(("VOTE", k_vote))
-            for mname, kval in mode_specs:
-                e, x = combine(pick, mode=mname, k=kval, index=df.index)
-                eq_c, net_c, pos_c, trades_c, _, _, _ = backtest_long_only(df, e, x, fee_bps=fee_bps, slip_bps=0)
-                m_c = metrics(eq_c, net_c)
-                label = mname if mname != "VOTE" else f"VOTE {kval}"
-                rows.append({"Combo": " & ".join(combo), "Mode": label, "Trades": int(trades_c), "TotalReturn": float(m_c["TotalReturn"])})
-    res = pd.DataFrame(rows).sort_values("TotalReturn", ascending=False).reset_index(drop=True)
-    res["TotalReturn(%)"] = (res["TotalReturn"] * 100).round(2)
-    return res[["Combo", "Mode", "Trades", "TotalReturn", "TotalReturn(%)"]]
-
-def make_crosshair_chart(base_df, x_col, y_col, y_title, main_label, buys_df, sells_df, buy_y_col, sell_y_col, highlight_df=None):
+@traced("app.make_crosshair_chart")
+def make_crosshair_chart(base_df, x_col, y_col, y_title, main_label, buys_df, sells_df, buy_y_col, sell_y_col, highlight_df=None,
+                         max_points=CHART_POINTS):
+    # uzun geçmişte çizgi LTTB ile seyreltilir; BUY/SELL barları her zaman kalır
+    marks = pd.concat([buys_df["date"], sells_df["date"]])
+    data = downsample(base_df[[x_col, y_col]], x_col, y_col, max_points, keep=base_df[x_col].isin(marks).to_numpy())
     nearest = alt.selection_point(nearest=True, on="pointerover", fields=[x_col], empty=False)
+    # veri katman düzeyinde bir kez verilir; aşağıdaki katmanlar onu paylaşır
+    shared = alt.Chart()
 
-    base = alt.Chart(base_df).mark_line().encode(
+    base = shared.mark_line().encode(
         x=alt.X(f"{x_col}:T", title="", axis=alt.Axis(labelAngle=-45, format="%d/%m/%y")),
         y=alt.Y(f"{y_col}:Q", title=y_title),
         tooltip=[
@@ -214,7 +184,7 @@ def make_crosshair_chart(base_df, x_col, y_col, y_title, main_label, buys_df, se
         ]
     )
 
-    selectors = alt.Chart(base_df).mark_point(opacity=0).encode(
+    selectors = shared.mark_point(opacity=0).encode(
         x=f"{x_col}:T",
         y=f"{y_col}:Q"
     ).add_params(nearest)
@@ -223,15 +193,15 @@ def make_crosshair_chart(base_df, x_col, y_col, y_title, main_label, buys_df, se
         opacity=alt.condition(nearest, alt.value(1), alt.value(0))
     )
 
-    vertical_rule = alt.Chart(base_df).mark_rule(color="#9ca3af", strokeDash=[4, 4]).encode(
+    vertical_rule = shared.mark_rule(color="#9ca3af", strokeDash=[4, 4]).encode(
         x=f"{x_col}:T"
     ).transform_filter(nearest)
 
-    horizontal_rule = alt.Chart(base_df).mark_rule(color="#9ca3af", strokeDash=[4, 4]).encode(
+    horizontal_rule = shared.mark_rule(color="#9ca3af", strokeDash=[4, 4]).encode(
         y=f"{y_col}:Q"
     ).transform_filter(nearest)
 
-    text = alt.Chart(base_df).mark_text(align="left", dx=8, dy=-8, fontSize=12).encode(
+    text = shared.mark_text(align="left", dx=8, dy=-8, fontSize=12).encode(
         x=f"{x_col}:T",
         y=f"{y_col}:Q",
         text=alt.Text(f"{y_col}:Q", format=",.2f")
@@ -255,16 +225,16 @@ def make_crosshair_chart(base_df, x_col, y_col, y_title, main_label, buys_df, se
         ]
     )
 
-    chart = base + selectors + points + vertical_rule + horizontal_rule + text + buys + sells
+    layers = [base, selectors, points, vertical_rule, horizontal_rule, text, buys, sells]
 
     if highlight_df is not None and not highlight_df.empty:
         highlight = alt.Chart(highlight_df).mark_rect(color="#00c853", opacity=0.5).encode(
             x=alt.X("start:T", axis=alt.Axis(labelAngle=-45, format="%d/%m/%y")),
             x2="end:T"
         )
-        chart = highlight + chart
+        layers = [highlight] + layers
 
-    return chart.interactive()
+    return alt.layer(*layers, data=data).interactive()
 
 if "search_results" not in st.session_state:
     st.session_state["search_results"] = []
@@ -283,8 +253,8 @@ if "init_capital_text" not in st.session_state:
 if "refreshed_symbols" not in st.session_state:
     st.session_state["refreshed_symbols"] = []
 
-df_all = load_data()
-symbols = sorted(df_all["symbol"].unique().tolist())
+sym_index = symbol_index()
+symbols = sorted(sym_index["symbol"].tolist())
 
 row = st.columns([2.0, 0.9, 1.2, 1.0, 0.9])
 
@@ -321,14 +291,14 @@ if search_click:
             cand.append(q.upper() + ".IS")
     matches = [s for s in symbols if any(c in s for c in cand)]
     if len(matches) == 0:
-        df_dates = pd.to_datetime(df_all["date"]) if not df_all.empty else pd.Series([], dtype="datetime64[ns]")
-        start_min = str(df_dates.min().date()) if len(df_dates) else "2015-01-01"
-        for c in cand:
-            if fetch_and_append(c, start_min):
-                df_all = load_data()
-                symbols = sorted(df_all["symbol"].unique().tolist())
-                matches = [c]
-                break
+        start_min = str(pd.to_datetime(sym_index["start"]).min().date()) if not sym_index.empty else "2015-01-01"
+        df_new = fetch(cand, start=start_min, interval="1d", adjust=True)
+        found = [c for c in cand if c in set(df_new["symbol"])]
+        if found:
+            append_bars(df_new[df_new["symbol"] == found[0]])
+            sym_index = symbol_index()
+            symbols = sorted(sym_index["symbol"].tolist())
+            matches = [found[0]]
         if len(matches) == 0:
             st.error("No data found for the given symbol.")
     st.session_state["search_results"] = matches
@@ -346,14 +316,13 @@ if len(st.session_state["search_results"]) > 1 and st.session_state["selected_sy
 symbol = st.session_state["selected_symbol"] or st.session_state["search_results"][0]
 
 if symbol not in st.session_state["refreshed_symbols"]:
-    refreshed = refresh_symbol_data(symbol, df_all)
+    refreshed = refresh_symbol_data(symbol, sym_index)
     st.session_state["refreshed_symbols"].append(symbol)
     if refreshed:
-        df_all = load_data()
-        symbols = sorted(df_all["symbol"].unique().tolist())
+        sym_index = symbol_index()
+        symbols = sorted(sym_index["symbol"].tolist())
 
-df_symbol_full = df_all[df_all["symbol"] == symbol].copy().reset_index(drop=True)
-df_symbol_full = df_symbol_full.sort_values("date").reset_index(drop=True)
+df_symbol_full = load_symbol(symbol)
 
 df = df_symbol_full[df_symbol_full["date"] >= pd.to_datetime(start_dt)].reset_index(drop=True)
 
@@ -384,7 +353,7 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-df_sig_init, sig_all_init = build_signals(df)
+df_sig_init, sig_all_init = load_signals(symbol, df, history=df_symbol_full)
 
 if st.session_state["pending_best"]:
     rank_df_init = rank_combos(df_sig_init, sig_all_init, fee_bps=fee_bps)
@@ -417,7 +386,8 @@ tma_m = int(side.number_input("TMA mid", min_value=5, max_value=200, value=20, s
 tma_s = int(side.number_input("TMA slow", min_value=10, max_value=400, value=50, step=1))
 vote_k = int(side.number_input("Vote k", min_value=1, max_value=4, value=st.session_state["vote_k"], step=1, key="vote_k"))
 
-df_sig, sig_all = build_signals(df, rsi_n, rsi_ob, rsi_os, cci_n, cci_up, cci_lo, ott_len, ott_pct, tma_f, tma_m, tma_s)
+df_sig, sig_all = load_signals(symbol, df, history=df_symbol_full, rsi_n=rsi_n, rsi_ob=rsi_ob, rsi_os=rsi_os, cci_n=cci_n, cci_up=cci_up, cci_lo=cci_lo,
+                               ott_len=ott_len, ott_pct=ott_pct, tma_f=tma_f, tma_m=tma_m, tma_s=tma_s)
 mode = st.session_state["mode_sel"]
 
 if mode != "NONE":
@@ -493,7 +463,8 @@ with left:
         sell_y_col="price",
         highlight_df=highlight_df
     )
-    st.altair_chart(price_chart, use_container_width=True)
+    with stage("app.altair_chart"):
+        st.altair_chart(price_chart, use_container_width=True)
 
     st.subheader(f"Equity • {symbol} • Mode: {mode} • Models: {', '.join(models) if mode != 'NONE' else 'Buy & Hold'}")
     eq_df = pd.DataFrame({"date": df_sig["date"], "equity": eq.values})
@@ -509,7 +480,8 @@ with left:
         sell_y_col="equity",
         highlight_df=highlight_df
     )
-    st.altair_chart(eq_chart, use_container_width=True)
+    with stage("app.altair_chart"):
+        st.altair_chart(eq_chart, use_container_width=True)
 
 with right:
     st.markdown(
@@ -541,4 +513,10 @@ with right:
         {"selector": "th", "props": [("text-align", "center")]},
         {"selector": "td", "props": [("text-align", "center")]}
     ]).set_properties(**{"text-align": "center"})
-    st.dataframe(styled_rank, use_container_width=True, height=520, hide_index=True)
\ No newline at end of file
+    st.dataframe(styled_rank, use_container_width=True, height=520, hide_index=True)
+
+with st.expander("Timing", expanded=False):
+    st.checkbox("Track allocations (tracemalloc)", key="trace_memory", disabled=not tracemalloc.is_tracing(),
+                help="Requires starting the app with PYTHONTRACEMALLOC=1")
+    timing = pd.DataFrame(timer.report(), columns=["stage", "calls", "seconds", "max_seconds", "alloc_bytes", "peak_bytes"])
+    st.dataframe(timing, use_container_width=True, hide_index=True)
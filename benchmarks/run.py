@@ -0,0 +1,127 @@
+"""Hot path benchmark'ları.
+
+    python -m benchmarks.run --cases 1k 100k --out bench.json
+    python -m benchmarks.run --cases 1k 100k --compare bench.json --tolerance 0.25
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import synthetic_ohlc, CASES
+from trader.utils.cache import INDICATOR_CACHE
+from trader.features.indicators import rsi, cci, ema
+from trader.signals.ott import compute_ott
+from trader.signals.build import build_signals
+from trader.signals.combine import combine
+from trader.backtest.engine import backtest_long_only
+from trader.backtest.metrics import metrics
+from trader.backtest.rank import rank_combos
+from trader.backtest.universe import iter_universe
+
+def _measure(fn, repeat: int, memory: bool):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak
+
+def _stages(df: pd.DataFrame):
+    """Tek sembol üzerinde sırayla çalışan pipeline aşamaları (ad, fonksiyon)."""
+    d = df.reset_index(drop=True)
+    d2, sig_all = build_signals(d)
+    entry, exit_ = combine(sig_all, mode="VOTE", k=2, index=d2.index)
+    eq, net, *_ = backtest_long_only(d2, entry, exit_)
+    return [
+        ("rsi", lambda: rsi(d["close"], 14)),
+        ("cci", lambda: cci(d, 20)),
+        ("ema", lambda: ema(d["close"], 20)),
+        ("compute_ott", lambda: compute_ott(d)),
+        ("build_signals", lambda: build_signals(d)),
+        ("combine", lambda: combine(sig_all, mode="VOTE", k=2, index=d2.index)),
+        ("backtest_long_only", lambda: backtest_long_only(d2, entry, exit_)),
+        ("metrics", lambda: metrics(eq, net)),
+        ("rank_combos", lambda: rank_combos(d2, sig_all, fee_bps=10)),
+    ]
+
+def run(cases, repeat: int = 3, memory: bool = True, seed: int = 0) -> dict:
+    # önbellek ölçüm süresince kapalı; çağıranın ayarı sonunda geri yüklenir
+    cache_was = INDICATOR_CACHE.enabled
+    INDICATOR_CACHE.enabled = False
+    results = []
+    try:
+        for case in cases:
+            n_bars, n_symbols = CASES[case]
+            df = synthetic_ohlc(n_bars, n_symbols, seed=seed)
+            if n_symbols == 1:
+                stages = _stages(df)
+            else:
+                stages = [("universe", lambda: list(iter_universe(df, workers=1)))]
+            for stage, fn in stages:
+                secs, peak = _measure(fn, repeat, memory)
+                results.append({"case": case, "stage": stage, "bars": n_bars, "symbols": n_symbols, "seconds": secs, "peak_bytes": peak})
+                print(f"{case:<10} {stage:<20} {secs * 1000:10.2f} ms  peak={peak if peak is not None else '-'}", flush=True)
+    finally:
+        INDICATOR_CACHE.enabled = cache_was
+    meta = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "repeat": repeat,
+        "seed": seed,
+    }
+    return {"meta": meta, "results": results}
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.25, min_seconds: float = 0.001) -> list:
+    """current, baseline'a göre (1 + tolerance) katından yavaşsa regresyon listesine girer."""
+    base = {(r["case"], r["stage"]): r for r in baseline["results"]}
+    regressions = []
+    for r in current["results"]:
+        b = base.get((r["case"], r["stage"]))
+        if b is None:
+            continue
+        ratio = r["seconds"] / b["seconds"] if b["seconds"] > 0 else float("inf")
+        slow = ratio > 1 + tolerance and r["seconds"] - b["seconds"] > min_seconds
+        flag = "REGRESSION" if slow else "ok"
+        print(f"{r['case']:<10} {r['stage']:<20} {b['seconds'] * 1000:10.2f} -> {r['seconds'] * 1000:10.2f} ms  x{ratio:5.2f}  {flag}")
+        if slow:
+            regressions.append({**r, "baseline_seconds": b["seconds"], "ratio": ratio})
+    return regressions
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--cases", nargs="+", default=["1k", "100k"], choices=list(CASES))
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", help="write results as JSON")
+    p.add_argument("--compare", help="baseline JSON to compare against")
+    p.add_argument("--tolerance", type=float, default=0.25)
+    args = p.parse_args(argv)
+
+    current = run(args.cases, repeat=args.repeat, memory=not args.no_memory, seed=args.seed)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(current, baseline, args.tolerance):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
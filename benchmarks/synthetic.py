@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+def synthetic_ohlc(n_bars: int, n_symbols: int = 1, seed: int = 0, start: str = "2000-01-03", freq: str = "min",
+                   vol: float = 0.01, drift: float = 0.0002) -> pd.DataFrame:
+    """Seed'li geometrik Brown hareketiyle store formatında (uzun) OHLCV üretir."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=n_bars, freq=freq)
+    frames = []
+    for j in range(n_symbols):
+        r = rng.normal(drift, vol, n_bars)
+        close = 100.0 * np.exp(np.cumsum(r))
+        open_ = np.empty(n_bars)
+        open_[0] = 100.0
+        open_[1:] = close[:-1] * np.exp(rng.normal(0.0, vol / 4, n_bars - 1))
+        spread = np.abs(rng.normal(0.0, vol, n_bars)) * close
+        high = np.maximum(open_, close) + spread
+        low = np.minimum(open_, close) - spread
+        frames.append(pd.DataFrame({
+            "date": dates,
+            "symbol": f"SYN{j:04d}",
+            "close": close,
+            "high": high,
+            "low": low,
+            "open": open_,
+            "volume": rng.integers(1_000, 1_000_000, n_bars).astype("float64"),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+CASES = {
+    "1k": (1_000, 1),
+    "100k": (100_000, 1),
+    "10M": (10_000_000, 1),
+    "1k-x1000": (1_000, 1_000),
+}
@@ -1,6 +1,6 @@
-def main():
-    print("Hello from 002-trading!")
+import sys
+from trader.cli import main
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
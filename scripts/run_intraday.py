@@ -0,0 +1,27 @@
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+from trader.io.intraday import append_intraday, open_intraday, intraday_rows
+from trader.datasources.yfinance_source import fetch_many
+from trader.backtest.chunked import backtest_chunked
+from trader.utils.timing import script_trace
+
+def main(symbol: str = "AAPL", interval: str = "1m", fetch: bool = True, mode: str = "VOTE", k: int | None = 2, fee_bps: int = 10):
+    if fetch:
+        # Yahoo 1m verisini yalnızca son ~7 gün için verir; her çalıştırma sona ekler
+        start = (pd.Timestamp.today() - pd.Timedelta(days=7)).date()
+        print("appended", append_intraday(fetch_many([symbol], start=start, interval=interval), interval))
+    if not intraday_rows(symbol, interval):
+        print("No data for", symbol)
+        return
+    res = backtest_chunked(open_intraday(symbol, interval), mode=mode, k=k, fee_bps=fee_bps, interval=interval)
+    print(pd.Series(res).round(4))
+
+if __name__ == "__main__":
+    with script_trace():
+        main(*sys.argv[1:3])
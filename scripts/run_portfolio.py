@@ -0,0 +1,23 @@
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import pandas as pd
+from trader.io.store import load_raw
+from trader.backtest.portfolio import signal_matrices, backtest_portfolio
+from trader.backtest.metrics import metrics
+from trader.utils.timing import script_trace
+
+def main(mode: str = "VOTE", k: int | None = 2, max_positions: int | None = 5, fee_bps: int = 10, capital: float = 10_000):
+    prices, ent, ext = signal_matrices(load_raw(), mode=mode, k=k)
+    eq, net, w, turnover = backtest_portfolio(prices, ent, ext, max_positions=max_positions, fee_bps=fee_bps, capital=capital)
+    print(pd.Series(metrics(eq / capital, net)).round(4))
+    print(f"symbols={prices.shape[1]} rebalances={int((turnover > 0).sum())} turnover={turnover.sum():.2f}")
+    print(eq.tail(5))
+
+if __name__ == "__main__":
+    with script_trace():
+        main()
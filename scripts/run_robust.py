@@ -0,0 +1,28 @@
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from trader.io.store import load_symbol
+from trader.io.signal_store import load_signals
+from trader.backtest.rank import rank_combos
+from trader.backtest.robust import robustness, combo_signals
+from trader.utils.timing import script_trace
+
+def main(symbol: str = "AAPL", n: int = 1000, fee_bps: int = 10):
+    df = load_symbol(symbol)
+    if df.empty:
+        print("No data for", symbol)
+        return
+    df2, sig_all = load_signals(symbol, df)
+    best = rank_combos(df2, sig_all, fee_bps=fee_bps).iloc[0]
+    entry, exit_ = combo_signals(sig_all, best["Combo"], best["Mode"])
+    _, summary = robustness(df2["close"], entry, exit_, n=n, fee_bps=fee_bps)
+    print(f"{symbol}: {best['Combo']} / {best['Mode']}")
+    print(summary.loc[(slice(None), ["TotalReturn", "CAGR", "MaxDD", "Sharpe"]), :].round(4).to_string())
+
+if __name__ == "__main__":
+    with script_trace():
+        main(*sys.argv[1:2])
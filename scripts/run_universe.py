@@ -0,0 +1,19 @@
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from trader.backtest.universe import run_universe
+from trader.utils.timing import script_trace
+
+def main(mode: str = "VOTE", k: int | None = 2, fee_bps: int = 10, slip_bps: int = 0, workers: int | None = None):
+    def show(row):
+        print(f"{row['symbol']:<12} ret={row['TotalReturn']:+.4f} maxdd={row['MaxDD']:+.4f} trades={row['Trades']}", flush=True)
+    res = run_universe(workers=workers, on_result=show, mode=mode, k=k, fee_bps=fee_bps, slip_bps=slip_bps)
+    print(res.round(4).to_string(index=False))
+
+if __name__ == "__main__":
+    with script_trace():
+        main()
@@ -0,0 +1,25 @@
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from trader.io.store import load_symbol
+from trader.backtest.walkforward import walk_forward
+from trader.backtest.metrics import metrics
+from trader.utils.timing import script_trace
+
+def main(symbol: str = "AAPL", train: int = 252 * 3, test: int = 252, anchored: bool = False, fee_bps: int = 10, workers: int | None = None):
+    df = load_symbol(symbol)
+    if df.empty:
+        print("No data for", symbol)
+        return
+    res, eq, net = walk_forward(df, train=train, test=test, anchored=anchored, fee_bps=fee_bps, workers=workers)
+    print(res.round(4).to_string(index=False))
+    if len(eq):
+        print(metrics(eq, net))
+
+if __name__ == "__main__":
+    with script_trace():
+        main(*sys.argv[1:2])
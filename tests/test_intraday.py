@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+import trader.io.intraday as intraday
+from trader.backtest.chunked import backtest_chunked
+
+def _bars(closes, start="2024-01-02 09:30"):
+    c = np.asarray(closes, dtype="float64")
+    return pd.DataFrame({"date": pd.date_range(start, periods=len(c), freq="min"), "symbol": "SYN",
+                         "open": c, "high": c, "low": c, "close": c, "volume": np.full(len(c), 10.0)})
+
+def test_nan_close_bars_are_not_stored(tmp_path, monkeypatch):
+    monkeypatch.setattr(intraday, "INTRADAY_DIR", str(tmp_path))
+    df = _bars([100, 101, np.nan, 102])
+    df.loc[1, ["high", "volume"]] = np.nan
+    assert intraday.append_intraday(df) == 3
+    cols = intraday.open_intraday("SYN")
+    assert cols["close"].tolist() == [100, 101, 102]
+    assert cols["high"].tolist() == [100, 101, 102]
+    assert cols["volume"].tolist() == [10, 0, 10]
+    res = backtest_chunked(cols, mode="NONE", chunk=2)
+    assert np.isfinite([res["TotalReturn"], res["CAGR"], res["Vol"]]).all()
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+from benchmarks.synthetic import synthetic_ohlc
+from trader.backtest.engine import backtest_long_only
+from trader.backtest.portfolio import backtest_portfolio, price_matrix, symbol_positions
+
+def _mixed_calendar():
+    # iki farklı tatil takvimi: birleşik tarihlerde her sembolün NaN barları olur
+    df = synthetic_ohlc(600, 3, seed=1, freq="D")
+    rng = np.random.default_rng(2)
+    keep = np.ones(len(df), dtype=bool)
+    for j, sym in enumerate(sorted(df["symbol"].unique())):
+        rows = np.flatnonzero(df["symbol"].to_numpy() == sym)
+        keep[rng.choice(rows, 40 + 20 * j, replace=False)] = False
+        keep[rows[:10 * j]] = False
+    df = df[keep].reset_index(drop=True)
+    prices = price_matrix(df)
+    ent = pd.DataFrame(rng.random(prices.shape) < 0.04, index=prices.index, columns=prices.columns).astype(int)
+    ext = pd.DataFrame(rng.random(prices.shape) < 0.04, index=prices.index, columns=prices.columns).astype(int)
+    return df, prices, ent.where(prices.notna(), 0), ext.where(prices.notna(), 0)
+
+def test_positions_follow_each_symbols_own_calendar():
+    df, prices, ent, ext = _mixed_calendar()
+    pos = pd.DataFrame(symbol_positions(prices, ent, ext), index=prices.index, columns=prices.columns)
+    for sym, g in df.groupby("symbol"):
+        dates = np.sort(g["date"].to_numpy())
+        own = backtest_long_only(pd.DataFrame({"close": prices.loc[dates, sym].to_numpy()}),
+                                 pd.Series(ent.loc[dates, sym].to_numpy()), pd.Series(ext.loc[dates, sym].to_numpy()))[2]
+        assert (pos.loc[dates, sym].to_numpy() == own.to_numpy()).all()
+        # tatil barlarında pozisyon taşınır, kapanmaz
+        assert pos[sym].sum() >= own.sum()
+
+def test_single_symbol_matches_long_only():
+    df, prices, ent, ext = _mixed_calendar()
+    sym = prices.columns[0]
+    p = prices[[sym]].dropna()
+    eq, net, *_ = backtest_portfolio(p, ent.loc[p.index, [sym]], ext.loc[p.index, [sym]], max_positions=1, fee_bps=0)
+    own_eq = backtest_long_only(pd.DataFrame({"close": p[sym].to_numpy()}), pd.Series(ent.loc[p.index, sym].to_numpy()),
+                                pd.Series(ext.loc[p.index, sym].to_numpy()), fee_bps=0)[0]
+    np.testing.assert_allclose(eq.to_numpy(), own_eq.to_numpy(), rtol=1e-12)
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from benchmarks.synthetic import synthetic_ohlc
+from trader.backtest.engine import _returns, _run_long_only, _run_protected
+
+FEES = 0.001
+
+def reference(c, h, lo, o, e, x, sl, tp, tr, mh):
+    # bar bar referans: _run_protected ile aynı kurallar, düz Python döngüsü
+    n = len(c)
+    pos, net = np.zeros(n, dtype=np.int64), np.zeros(n)
+    held, entry, peak, start = False, None, None, None
+    for t in range(n):
+        fee = FEES * bool(e[t] or x[t])
+        if held:
+            stop_lv = max(entry * (1 - sl / 100) if sl is not None else -np.inf,
+                          peak * (1 - tr / 100) if tr is not None else -np.inf)
+            tp_lv = entry * (1 + tp / 100) if tp is not None else np.inf
+            down, up = lo[t] <= stop_lv, h[t] >= tp_lv
+            if down or up:
+                op = c[t - 1] if o is None else o[t]
+                px = op if op >= tp_lv else min(stop_lv, op) if down else tp_lv
+                px = min(max(px, lo[t]), h[t])
+                net[t] = px / c[t - 1] - 1 - FEES
+                held = False
+                continue
+            net[t] = c[t] / c[t - 1] - 1
+            peak = max(peak, h[t])
+            if x[t] or (mh is not None and t - start >= mh):
+                net[t] -= FEES
+                held = False
+                continue
+            net[t] -= fee
+            pos[t] = 1
+        else:
+            if t > 0 and e[t]:
+                held, entry, peak, start = True, c[t], c[t], t
+            net[t] -= fee
+            pos[t] = int(held)
+    return pos, net
+
+@pytest.fixture(scope="module")
+def data():
+    df = synthetic_ohlc(1500, seed=4, freq="D", vol=0.02, drift=0.0)
+    rng = np.random.default_rng(0)
+    e = rng.random((len(df), 12)) < 0.03
+    x = rng.random((len(df), 12)) < 0.03
+    return {k: df[k].to_numpy() for k in ("close", "high", "low", "open")}, e, x
+
+def test_signal_only_matches_long_only(data):
+    px, e, x = data
+    p0, n0 = _run_long_only(_returns(px["close"]), e, x, FEES)
+    p1, n1 = _run_protected(px["close"], px["high"], px["low"], None, e, x, FEES)
+    assert (p0 == p1).all() and (n0 == n1).all()
+
+@pytest.mark.parametrize("ohlc", ["full", "no_open", "close_only"])
+@pytest.mark.parametrize("sl,tp,tr,mh", [(5, None, None, None), (None, 8, None, None), (None, None, 4, None),
+                                         (3, 6, 2, 15), (None, None, None, 10), (2, 2, None, None)])
+def test_matches_reference(data, ohlc, sl, tp, tr, mh):
+    px, e, x = data
+    c = px["close"]
+    h, lo = (c, c) if ohlc == "close_only" else (px["high"], px["low"])
+    o = px["open"] if ohlc == "full" else None
+    p, net = _run_protected(c, h, lo, o, e, x, FEES, sl, tp, tr, mh)
+    for j in range(e.shape[1]):
+        rp, rn = reference(c, h, lo, o, e[:, j], x[:, j], sl, tp, tr, mh)
+        assert (rp == p[:, j]).all()
+        np.testing.assert_allclose(net[:, j], rn, rtol=0, atol=1e-15)
+
+def test_gap_fills_inside_bar_range():
+    # 110 tepesinden %2 trailing; sonraki bar 85'in üstüne hiç çıkmıyor
+    c = np.array([100.0, 105, 110, 80])
+    h = np.array([100.0, 106, 110, 85])
+    lo = np.array([99.0, 104, 108, 78])
+    e = np.array([[False], [True], [False], [False]])
+    x = np.zeros_like(e)
+    _, net = _run_protected(c, h, lo, None, e, x, 0.0, trailing=2)
+    assert net[3, 0] == pytest.approx(85 / 110 - 1)
+
+def test_max_hold_must_be_positive(data):
+    px, e, x = data
+    with pytest.raises(ValueError):
+        _run_protected(px["close"], px["high"], px["low"], None, e, x, FEES, max_hold=0)
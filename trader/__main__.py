@@ -0,0 +1,4 @@
+import sys
+from trader.cli import main
+
+sys.exit(main())
@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+from trader.signals.ott import ott_chunk
+from trader.signals.combine import pack_signals, combine_packed
+from trader.backtest.engine import _run_long_only, _transitions
+from trader.backtest.metrics import periods_per_year
+from trader.utils.timing import traced
+
+PARAMS = {"rsi_n": 14, "rsi_ob": 70, "rsi_os": 30, "cci_n": 20, "cci_up": 100, "cci_lo": -100,
+          "ott_len": 2, "ott_pct": 1.4, "tma_f": 5, "tma_m": 20, "tma_s": 50}
+
+def _ewm(x: pd.Series, last, **kw) -> pd.Series:
+    # adjust=False ewm'de önceki parçanın son değeri başa eklenince özyineleme aynen sürer
+    if last is None or np.isnan(last):
+        return x.ewm(adjust=False, **kw).mean()
+    return pd.concat([pd.Series([last]), x], ignore_index=True).ewm(adjust=False, **kw).mean().iloc[1:].reset_index(drop=True)
+
+def _rolling(x: pd.Series, tail: np.ndarray, n: int) -> pd.Series:
+    out = pd.Series(np.concatenate([tail, x.to_numpy()])).rolling(n).mean()
+    return out.iloc[len(tail):].reset_index(drop=True)
+
+def _shift(x: pd.Series, prev) -> pd.Series:
+    return pd.Series(np.concatenate([[prev], x.to_numpy()[:-1]]), dtype=x.dtype)
+
+class ChunkSignals:
+    """build_signals() modellerinin parça parça hesaplanan karşılığı.
+
+    EMA/RSI/OTT/TMA özyinelemeleri son bar state'i taşınarak tüm seri üzerindeki
+    sonuçla aynı çıkar; CCI'nin rolling pencereleri önceki parçanın son n-1
+    değeriyle yeniden başlatıldığından yalnızca son bit düzeyinde farklı olabilir.
+    """
+
+    def __init__(self, **params):
+        self.p = {**PARAMS, **params}
+        self.s = {}
+
+    def update(self, high: np.ndarray, low: np.ndarray, close: np.ndarray) -> dict:
+        p, s = self.p, self.s
+        c = pd.Series(np.asarray(close, dtype="float64"))
+        h = pd.Series(np.asarray(high, dtype="float64"))
+        lo = pd.Series(np.asarray(low, dtype="float64"))
+
+        # RSI
+        d = c.diff()
+        if "close" in s and len(c):
+            d.iat[0] = c.iat[0] - s["close"]
+        n = p["rsi_n"]
+        up = _ewm(d.clip(lower=0), s.get("rsi_up"), alpha=1 / n)
+        dn = _ewm(-d.clip(upper=0), s.get("rsi_dn"), alpha=1 / n)
+        r = 100 - (100 / (1 + up / dn.replace(0, np.nan)))
+        rp = _shift(r, s.get("rsi", np.nan))
+        rsi_b = (rp < p["rsi_os"]) & (r >= p["rsi_os"])
+        rsi_s = (rp > p["rsi_ob"]) & (r <= p["rsi_ob"])
+
+        # CCI
+        n = p["cci_n"]
+        tp = (h + lo + c) / 3
+        sma_tp = _rolling(tp, s.get("tp_tail", np.empty(0)), n)
+        dev = (tp - sma_tp).abs()
+        md = _rolling(dev, s.get("dev_tail", np.empty(0)), n)
+        cc = (tp - sma_tp) / (0.015 * md)
+        cp = _shift(cc, s.get("cci", np.nan))
+        cci_b = (cp < p["cci_lo"]) & (cc >= p["cci_lo"])
+        cci_s = (cp > p["cci_up"]) & (cc <= p["cci_up"])
+
+        # OTT
+        mav = _ewm(c, s.get("ott_mav"), span=p["ott_len"])
+        ott, ott_state = ott_chunk(mav.to_numpy(), p["ott_pct"], s.get("ott_state"))
+        o = pd.Series(ott)
+        xp, op = _shift(c, s.get("close", np.nan)), _shift(o, s.get("ott", np.nan))
+        ott_b = (xp <= op) & (c > o)
+        ott_s = (xp >= op) & (c < o)
+
+        # TMA
+        mf = _ewm(c, s.get("tma_f"), span=p["tma_f"])
+        mm = _ewm(c, s.get("tma_m"), span=p["tma_m"])
+        ms = _ewm(c, s.get("tma_s"), span=p["tma_s"])
+        up_ = (mf > mm) & (mm > ms)
+        dn_ = (mf < mm) & (mm < ms)
+        tma_b = ~_shift(up_, s.get("up", False)) & up_
+        tma_s = ~_shift(dn_, s.get("dn", False)) & dn_
+
+        if len(c):
+            s.update({
+                "close": c.iat[-1], "rsi_up": up.iat[-1], "rsi_dn": dn.iat[-1], "rsi": r.iat[-1],
+                "tp_tail": np.concatenate([s.get("tp_tail", np.empty(0)), tp.to_numpy()])[-(n - 1):] if n > 1 else np.empty(0),
+                "dev_tail": np.concatenate([s.get("dev_tail", np.empty(0)), dev.to_numpy()])[-(n - 1):] if n > 1 else np.empty(0),
+                "cci": cc.iat[-1], "ott_mav": mav.iat[-1], "ott_state": ott_state, "ott": o.iat[-1],
+                "tma_f": mf.iat[-1], "tma_m": mm.iat[-1], "tma_s": ms.iat[-1], "up": bool(up_.iat[-1]), "dn": bool(dn_.iat[-1]),
+            })
+        return {"OTT": (ott_b.to_numpy(), ott_s.to_numpy()), "TMA": (tma_b.to_numpy(), tma_s.to_numpy()),
+                "CCI": (cci_b.to_numpy(), cci_s.to_numpy()), "RSI": (rsi_b.to_numpy(), rsi_s.to_numpy())}
+
+@traced()
+def backtest_chunked(cols: dict, mode: str = "VOTE", k: int | None = 2, fee_bps: int = 10, slip_bps: int = 0,
+                     params: dict | None = None, interval: str = "1m", chunk: int = 1_000_000, out: str | None = None) -> dict:
+    """Kolon buffer'ları (ör. open_intraday) üzerinde parça parça sinyal + long-only backtest.
+
+    Her parçada yalnızca o parçanın dizileri bellekte tutulur; pozisyon, equity,
+    tepe değer ve getiri istatistikleri parçalar arasında taşınır. ``out`` verilirse
+    equity eğrisi .npy memmap olarak yazılır. Dönüş metrics() KPI'ları ile trade sayılarıdır.
+    """
+    n = len(cols["close"])
+    freq = periods_per_year(interval)
+    fees = (fee_bps + slip_bps) / 10000.0
+    sigs = ChunkSignals(**(params or {}))
+    eq_out = np.lib.format.open_memmap(out, mode="w+", dtype="float64", shape=(n,)) if out else None
+    m = mode.upper()
+    pos = 0
+    prev_close = None
+    eq_last = 1.0
+    peak = -np.inf
+    maxdd = 0.0
+    entries = exits = 0
+    count, mean, m2 = 0, 0.0, 0.0
+    for start in range(0, n, chunk):
+        stop = min(start + chunk, n)
+        close = np.asarray(cols["close"][start:stop], dtype="float64")
+        sig = sigs.update(cols["high"][start:stop], cols["low"][start:stop], close)
+        if m == "NONE":
+            e = np.zeros(stop - start, dtype=bool)
+            x = np.zeros(stop - start, dtype=bool)
+            e[0] = start == 0
+        else:
+            buy, sell, names = pack_signals(sig)
+            e, x = combine_packed(buy, sell, (1 << len(names)) - 1, mode=m, k=k)
+
+        # önceki parçanın son barı başa eklenir: pozisyon ve getiri kaldığı yerden sürer
+        if prev_close is None:
+            ret = pd.Series(close).pct_change().fillna(0.0).to_numpy()
+            p, net = _run_long_only(ret, e, x, fees)
+        else:
+            ret = np.concatenate([[0.0], close / np.concatenate([[prev_close], close[:-1]]) - 1])
+            p, net = _run_long_only(ret, np.concatenate([[False], e]), np.concatenate([[False], x]), fees, initial=pos)
+        ne, nx = _transitions(p)
+        entries, exits = entries + int(ne), exits + int(nx)
+        if prev_close is not None:
+            p, net = p[1:], net[1:]
+
+        eq = np.cumprod(np.concatenate([[eq_last], 1.0 + net]))[1:]
+        peaks = np.maximum.accumulate(np.concatenate([[peak], eq]))[1:]
+        maxdd = min(maxdd, float((eq / peaks - 1.0).min()))
+        if eq_out is not None:
+            eq_out[start:stop] = eq
+
+        # Chan birleştirmesi ile parça parça varyans
+        cm, cn = net.mean(), len(net)
+        cm2 = ((net - cm) ** 2).sum()
+        delta = cm - mean
+        total = count + cn
+        m2 += cm2 + delta * delta * count * cn / total
+        mean += delta * cn / total
+        count = total
+
+        pos, prev_close, eq_last, peak = int(p[-1]), close[-1], eq[-1], peaks[-1]
+    if eq_out is not None:
+        eq_out.flush()
+    res = {
+        "TotalReturn": float(eq_last - 1.0) if n else 0.0,
+        "CAGR": float(eq_last ** (freq / max(n, 1)) - 1.0) if n else 0.0,
+        "MaxDD": maxdd,
+        "Vol": float((m2 / (count - 1)) ** 0.5 * freq ** 0.5) if count > 1 else (float("nan") if n else 0.0),
+        "Days": n,
+    }
+    res.update({"Trades": min(entries, exits), "Buys": entries, "Sells": exits, "OpenTrades": max(entries - exits, 0)})
+    return res
@@ -1,24 +1,288 @@
+import numpy as np
 import pandas as pd
+from trader.utils.timing import traced
 
-def backtest_long_only(df: pd.DataFrame, entry: pd.Series, exit_: pd.Series, fee_bps: int = 10, slip_bps: int = 0):
-    price = df["close"]
-    ret = price.pct_change().fillna(0.0)
-    pos = pd.Series(0, index=df.index, dtype="int64")
-    entries = 0
-    exits = 0
-    for i in range(1, len(df)):
-        if exit_.iat[i] == 1 and pos.iat[i - 1] == 1:
-            pos.iat[i] = 0
-            exits += 1
-        elif entry.iat[i] == 1 and pos.iat[i - 1] == 0:
-            pos.iat[i] = 1
-            entries += 1
-        else:
-            pos.iat[i] = pos.iat[i - 1]
+def _long_only_positions(entry: np.ndarray, exit_: np.ndarray, initial: int = 0) -> np.ndarray:
+    # Bar 0 holds ``initial`` (flat unless a previous chunk left a position). Afterwards an entry-only bar forces 1, an exit-only bar
+    # forces 0 and a bar with both flips the state, so the position is the value of
+    # the last forcing bar XOR the parity of flips seen since. Works on (bars,) and
+    # (bars, strategies) arrays alike.
+    n = entry.shape[0]
+    e = entry.astype(bool, copy=True)
+    x = exit_.astype(bool, copy=True)
+    if n == 0:
+        return np.zeros(entry.shape, dtype=np.int64)
+    e[0] = bool(initial)
+    x[0] = False
+    forced = e ^ x
+    forced[0] = True
+    idx = np.arange(n).reshape((n,) + (1,) * (entry.ndim - 1))
+    last = np.maximum.accumulate(np.where(forced, idx, 0), axis=0)
+    flips = np.cumsum(e & x, axis=0)
+    parity = (flips - np.take_along_axis(flips, last, axis=0)) & 1
+    return (np.take_along_axis(e, last, axis=0) ^ parity.astype(bool)).astype(np.int64)
+
+def _transitions(pos: np.ndarray):
+    d = np.diff(pos, axis=0)
+    return (d == 1).sum(axis=0), (d == -1).sum(axis=0)
+
+def _returns(price) -> np.ndarray:
+    return pd.Series(price).pct_change().fillna(0.0).to_numpy(dtype="float64")
+
+def _ohlc(close, high=None, low=None, open_=None):
+    c = np.asarray(close, dtype="float64")
+    h = c if high is None else np.asarray(high, dtype="float64")
+    lo = c if low is None else np.asarray(low, dtype="float64")
+    return c, h, lo, None if open_ is None else np.asarray(open_, dtype="float64")
+
+def _run_long_only(ret: np.ndarray, e: np.ndarray, x: np.ndarray, fees: float, initial: int = 0):
+    p = _long_only_positions(e, x, initial)
+    prev = np.zeros(p.shape, dtype="float64")
+    prev[1:] = p[:-1]
+    r = ret if p.ndim == 1 else ret[:, None]
+    net = prev * r - (e | x) * fees
+    return p, net
+
+def _per_column(v, m: int, default: float) -> np.ndarray:
+    # None: kural kapalı (default); aksi halde skaler ya da strateji başına bir değer
+    if v is None:
+        return np.full(m, default, dtype="float64")
+    return np.broadcast_to(np.asarray(v, dtype="float64"), (m,)).astype("float64")
+
+def _next_true(a: np.ndarray) -> np.ndarray:
+    # out[i, j] = i'den itibaren a[:, j]'nin ilk True satırı, yoksa n (n. satır bekçi)
+    n, m = a.shape
+    idx = np.where(a, np.arange(n)[:, None], n)
+    out = np.full((n + 1, m), n, dtype=np.int64)
+    out[:n] = np.minimum.accumulate(idx[::-1], axis=0)[::-1]
+    return out
+
+def _first_stop(s, limit, close, high, low, open_, stop_lv, tp_lv, trail):
+    """Açık işlemlerin (s, limit] içindeki ilk koruyucu çıkış barı ve dolum fiyatı (yoksa bar n).
+
+    Tüm işlemler her turda iki katına çıkan pencerelerle birlikte taranır. Aynı barda
+    hem stop hem hedef değerse stop varsayılır.
+    """
+    n = len(close)
+    k = len(s)
+    hit_t = np.full(k, n, dtype=np.int64)
+    hit_px = np.full(k, np.nan)
+    peak = close[s].astype("float64")
+    start = s + 1
+    lim = np.minimum(limit, n - 1)
+    todo = np.flatnonzero(start <= lim)
+    width = 16
+    while todo.size:
+        T = start[todo, None] + np.arange(width)
+        valid = T <= lim[todo, None]
+        Tc = np.minimum(T, n - 1)
+        lo, hi = low[Tc], high[Tc]
+        pk = np.empty_like(hi)
+        pk[:, 0] = peak[todo]
+        pk[:, 1:] = np.maximum(peak[todo, None], np.maximum.accumulate(hi[:, :-1], axis=1))
+        level = np.maximum(stop_lv[todo, None], pk * (1.0 - trail[todo, None]))
+        down = valid & (lo <= level)
+        up = valid & (hi >= tp_lv[todo, None])
+        hit = down | up
+        found = hit.any(axis=1)
+        rows, first = np.flatnonzero(found), hit.argmax(axis=1)[found]
+        if rows.size:
+            i = todo[rows]
+            t = T[rows, first]
+            lv, tp = level[rows, first], tp_lv[i]
+            is_down = down[rows, first]
+            # seviyenin ötesine gap açılışta dolar; open yoksa önceki kapanış açılış sayılır
+            o = close[t - 1] if open_ is None else open_[t]
+            px = np.where(o >= tp, o, np.where(o <= lv, np.where(is_down, o, tp), np.where(is_down, lv, tp)))
+            hit_t[i], hit_px[i] = t, np.clip(px, low[t], high[t])
+        more = ~found & (T[:, -1] < lim[todo])
+        peak[todo[more]] = np.maximum(peak[todo[more]], hi[more].max(axis=1))
+        start[todo[more]] = T[more, -1] + 1
+        todo = todo[more]
+        width *= 2
+    return hit_t, hit_px
+
+def _run_protected(close, high, low, open_, e, x, fees, stop_loss=None, take_profit=None, trailing=None, max_hold=None):
+    """Sinyallere ek stop-loss / take-profit / trailing / max_hold çıkışlarıyla long-only (pos, net).
+
+    Yüzdeler (5 = %5) giriş kapanışına göredir; döngü bar değil işlem adımlar. Koruyucu
+    çıkışlar da ücret öder; stop verilmezse sonuç _run_long_only ile aynıdır.
+    """
+    n, m = e.shape
+    sl = _per_column(stop_loss, m, np.inf) / 100.0
+    tp = _per_column(take_profit, m, np.inf) / 100.0
+    tr = _per_column(trailing, m, np.inf) / 100.0
+    hold = _per_column(max_hold, m, max(n, 1))
+    if (hold < 1).any():
+        raise ValueError("max_hold must be at least 1 bar")
+    hold = np.minimum(hold, n).astype(np.int64)
+    ne, nx = _next_true(e), _next_true(x)
+    d = np.zeros((n + 1, m), dtype=np.int64)
+    stopped = np.zeros((n, m), dtype=bool)
+    forced = np.zeros((n, m), dtype=bool)
+    fill = np.zeros((n, m))
+    cursor = np.ones(m, dtype=np.int64)
+    cols = np.arange(m)
+    while cols.size:
+        s = ne[np.minimum(cursor[cols], n), cols]
+        cols, s = cols[s < n], s[s < n]
+        if not cols.size:
+            break
+        limit = np.minimum(nx[s + 1, cols], s + hold[cols])
+        c0 = close[s]
+        t, px = _first_stop(s, limit, close, high, low, open_, c0 * (1.0 - sl[cols]), c0 * (1.0 + tp[cols]), tr[cols])
+        stop = (t <= limit) & (t < n)
+        end = np.where(stop, t, np.minimum(limit, n))
+        d[s, cols] += 1
+        d[end, cols] -= 1
+        stopped[t[stop], cols[stop]] = True
+        fill[t[stop], cols[stop]] = px[stop] / close[t[stop] - 1] - 1.0
+        timed = ~stop & (limit < n)
+        forced[limit[timed], cols[timed]] = True
+        cursor[cols] = end + 1
+        cols = cols[end < n]
+    p = np.cumsum(d[:n], axis=0)
+    prev = np.zeros(p.shape, dtype="float64")
+    prev[1:] = p[:-1]
+    r = np.where(stopped, fill, _returns(close)[:, None])
+    net = prev * r - (e | x | stopped | forced) * fees
+    return p, net
+
+# {-1, 0, +1} pozisyon geçişleri: her bar (entry, exit) çiftine göre bir durum eşlemesi uygular;
+# eşlemeler 0..26 id'leriyle (f(-1), f(0), f(1) taban-3) tutulur, bileşke _COMPOSE'dan okunur.
+SIDES = ("long", "long_short", "flat")
+
+def _map_id(f) -> int:
+    return sum((f(s) + 1) * 3 ** (s + 1) for s in (-1, 0, 1))
+
+def _apply(i: int, s: int) -> int:
+    return (i // 3 ** (s + 1)) % 3 - 1
+
+_ID = _map_id(lambda s: s)
+# _COMPOSE[27 * a + b] = "önce b, sonra a"
+_COMPOSE = np.array([_map_id(lambda s, a=a, b=b: _apply(a, _apply(b, s))) for a in range(27) for b in range(27)], dtype=np.int16)
+_FROM_FLAT = np.array([_apply(i, 0) for i in range(27)], dtype=np.int64)
+# yön x (sinyal yok, entry, exit, ikisi)
+_TRANSITIONS = np.array([
+    # long: _long_only_positions kuralları
+    [_ID, _map_id(lambda s: 1), _map_id(lambda s: 0), _map_id(lambda s: 1 - abs(s))],
+    # long_short: entry -> +1, exit -> -1 (stop and reverse)
+    [_ID, _map_id(lambda s: 1), _map_id(lambda s: -1), _ID],
+    # flat: sinyal başına bir adım, ters yöne geçmeden önce kapatılır
+    [_ID, _map_id(lambda s: min(s + 1, 1)), _map_id(lambda s: max(s - 1, -1)), _ID],
+], dtype=np.int16)
+
+def _side_positions(entry: np.ndarray, exit_: np.ndarray, side) -> np.ndarray:
+    """(bar x strateji) pozisyonları; ``side`` tek bir yön ya da kolon başına bir yön.
+
+    Bar eşlemeleri ikiye katlanan prefix scan ile birleştirilir (log2(bar) adım);
+    bar 0 long-only motordaki gibi düzdür.
+    """
+    n, m = entry.shape
+    sides = np.broadcast_to(np.asarray([SIDES.index(x) for x in np.atleast_1d(side)]), (m,))
+    maps = _TRANSITIONS[sides[None, :], entry.astype(np.int64) + 2 * exit_.astype(np.int64)]
+    if n:
+        maps[0] = _ID
+    d = 1
+    while d < n:
+        maps[d:] = _COMPOSE[maps[d:] * 27 + maps[:-d]]
+        d *= 2
+    return _FROM_FLAT[maps]
+
+def _run_sides(ret: np.ndarray, e: np.ndarray, x: np.ndarray, side, fees, borrow: float = 0.0):
+    p = _side_positions(e, x, side)
+    prev = np.zeros(p.shape, dtype="float64")
+    prev[1:] = p[:-1]
+    # sinyal barı bir bacak öder (long-only gibi), reversal iki
+    legs = np.maximum(np.abs(p - prev), e | x)
+    net = prev * ret[:, None] - legs * fees - (prev < 0) * borrow
+    return p, net
+
+def _side_transitions(p: np.ndarray):
+    # açılan / kapanan pozisyonlar; reversal ikisini de sayar
+    prev = np.zeros_like(p)
+    prev[1:] = p[:-1]
+    changed = p != prev
+    return (changed & (p != 0)).sum(axis=0), (changed & (prev != 0)).sum(axis=0)
+
+@traced()
+def backtest_long_only(df: pd.DataFrame, entry: pd.Series, exit_: pd.Series, fee_bps: int = 10, slip_bps: int = 0,
+                       stop_loss: float | None = None, take_profit: float | None = None, trailing: float | None = None,
+                       max_hold: int | None = None):
+    """Long-only backtest; stop_loss/take_profit/trailing (%) ve max_hold (bar) df'in high/low'unu kullanır."""
+    e = np.asarray(entry) == 1
+    x = np.asarray(exit_) == 1
     fees = (fee_bps + slip_bps) / 10000.0
-    traded = ((entry == 1) | (exit_ == 1)).astype(int)
-    net = pos.shift(1).fillna(0) * ret - traded * fees
+    if stop_loss is None and take_profit is None and trailing is None and max_hold is None:
+        p, net = _run_long_only(_returns(df["close"]), e, x, fees)
+    else:
+        p, net = _run_protected(*_ohlc(df["close"], df.get("high"), df.get("low"), df.get("open")), e[:, None], x[:, None], fees,
+                                stop_loss, take_profit, trailing, max_hold)
+        p, net = p[:, 0], net[:, 0]
+    entries, exits = (int(v) for v in _transitions(p))
+    pos = pd.Series(p, index=df.index, dtype="int64")
+    net = pd.Series(net, index=df.index)
     eq = (1.0 + net).cumprod()
     trades = int(min(entries, exits))
     open_trades = int(max(entries - exits, 0))
-    return eq, net, pos, trades, entries, exits, open_trades
\ No newline at end of file
+    return eq, net, pos, trades, entries, exits, open_trades
+
+@traced()
+def backtest_batch(price: pd.Series, entries, exits, fee_bps: int = 10, slip_bps: int = 0, stop_loss=None, take_profit=None,
+                   trailing=None, max_hold=None, high=None, low=None, open_=None):
+    """Long-only backtest of many entry/exit columns (bars x strategies) against one price series.
+
+    Column j gives the same eq/net/pos/trades as backtest_long_only on column j.
+    DataFrame inputs give DataFrame/Series outputs labelled like ``entries``.
+    Stop parametreleri skaler ya da kolon başına olabilir; ``high``/``low`` yoksa close kullanılır.
+    """
+    e = np.asarray(entries) == 1
+    x = np.asarray(exits) == 1
+    if e.ndim == 1:
+        e, x = e[:, None], x[:, None]
+    fees = (fee_bps + slip_bps) / 10000.0
+    if stop_loss is None and take_profit is None and trailing is None and max_hold is None:
+        p, net = _run_long_only(_returns(price), e, x, fees)
+    else:
+        p, net = _run_protected(*_ohlc(price, high, low, open_), e, x, fees, stop_loss, take_profit, trailing, max_hold)
+    eq = np.cumprod(1.0 + net, axis=0)
+    n_entries, n_exits = _transitions(p)
+    trades = np.minimum(n_entries, n_exits)
+    if isinstance(entries, pd.DataFrame):
+        idx, cols = entries.index, entries.columns
+        return (pd.DataFrame(eq, index=idx, columns=cols), pd.DataFrame(net, index=idx, columns=cols),
+                pd.DataFrame(p, index=idx, columns=cols), pd.Series(trades, index=cols))
+    return eq, net, p, trades
+
+@traced()
+def backtest_sides(price: pd.Series, entries, exits, side="long_short", fee_bps: int = 10, slip_bps: int = 0,
+                   borrow_bps: float = 0.0, freq: int = 252):
+    """Çok kolonlu long / long_short / flat backtest; dönüş (eq, net, pos, trades).
+
+    ``side`` tüm kolonlar için tek ya da kolon başına verilir ("long" backtest_batch ile
+    aynıdır). ``borrow_bps`` short pozisyonda bar başına işleyen yıllık ödünç maliyetidir.
+    """
+    e = np.asarray(entries) == 1
+    x = np.asarray(exits) == 1
+    if e.ndim == 1:
+        e, x = e[:, None], x[:, None]
+    fees = (fee_bps + slip_bps) / 10000.0
+    p, net = _run_sides(_returns(price), e, x, side, fees, borrow_bps / 10000.0 / freq)
+    eq = np.cumprod(1.0 + net, axis=0)
+    _, trades = _side_transitions(p)
+    if isinstance(entries, pd.DataFrame):
+        idx, cols = entries.index, entries.columns
+        return (pd.DataFrame(eq, index=idx, columns=cols), pd.DataFrame(net, index=idx, columns=cols),
+                pd.DataFrame(p, index=idx, columns=cols), pd.Series(trades, index=cols))
+    return eq, net, p, trades
+
+@traced()
+def backtest_long_short(df: pd.DataFrame, entry: pd.Series, exit_: pd.Series, side: str = "long_short", fee_bps: int = 10,
+                        slip_bps: int = 0, borrow_bps: float = 0.0, freq: int = 252):
+    """backtest_sides'ın backtest_long_only biçiminde tek seri karşılığı."""
+    eq, net, p, trades = backtest_sides(df["close"], entry, exit_, side=side, fee_bps=fee_bps, slip_bps=slip_bps,
+                                        borrow_bps=borrow_bps, freq=freq)
+    opened, closed = (int(v[0]) for v in _side_transitions(p))
+    pos = pd.Series(p[:, 0], index=df.index, dtype="int64")
+    return (pd.Series(eq[:, 0], index=df.index), pd.Series(net[:, 0], index=df.index), pos, int(trades[0]), opened, closed,
+            int(opened - closed))
@@ -1,10 +1,102 @@
 import pandas as pd
 import numpy as np
+from trader.utils.timing import traced
 
+_INTERVAL_MINUTES = {"m": 1, "h": 60}
+_PER_YEAR = {"d": 252, "wk": 52, "mo": 12}
+
+def periods_per_year(interval: str = "1d", session_minutes: float = 390) -> float:
+    """yfinance interval'ı (1m, 5m, 1h, 1d, 1wk, 1mo...) için yıllık bar sayısı.
+
+    Gün içi barlar için işlem günü ``session_minutes`` dakika kabul edilir (NYSE 390).
+    """
+    num = "".join(ch for ch in interval if ch.isdigit()) or "1"
+    unit = interval[len(num):]
+    if unit in _INTERVAL_MINUTES:
+        return 252 * session_minutes / (int(num) * _INTERVAL_MINUTES[unit])
+    if unit in _PER_YEAR:
+        return _PER_YEAR[unit] / int(num)
+    raise ValueError(f"unknown interval: {interval}")
+
+@traced()
 def metrics(eq: pd.Series, net: pd.Series, freq: int = 252):
     total_return = float(eq.iloc[-1] - 1.0) if len(eq) else 0.0
     cagr = float(eq.iloc[-1] ** (freq / max(len(eq), 1)) - 1.0) if len(eq) else 0.0
     maxdd = float((eq / eq.cummax() - 1.0).min()) if len(eq) else 0.0
     vol = float(net.std() * (freq ** 0.5)) if len(net) else 0.0
     days = int(len(eq))
-    return {"TotalReturn": total_return, "CAGR": cagr, "MaxDD": maxdd, "Vol": vol, "Days": days}
\ No newline at end of file
+    return {"TotalReturn": total_return, "CAGR": cagr, "MaxDD": maxdd, "Vol": vol, "Days": days}
+
+def _safe_div(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    out = np.zeros(np.broadcast(a, b).shape, dtype="float64")
+    np.divide(a, b, out=out, where=b != 0)
+    return out
+
+def _underwater_duration(eq: np.ndarray) -> np.ndarray:
+    # her bar için son zirveden beri geçen bar sayısı; kolon başına maksimumu alınır
+    idx = np.arange(len(eq))[:, None]
+    peak_bar = np.maximum.accumulate(np.where(eq >= np.maximum.accumulate(eq, axis=0), idx, 0), axis=0)
+    return (idx - peak_bar).max(axis=0)
+
+def _win_rate(net: np.ndarray, pos: np.ndarray) -> np.ndarray:
+    # trade = 0->1 geçişinden çıkış barına kadar (çıkış barı dahil) net getirilerin bileşiği
+    prev = np.zeros_like(pos)
+    prev[1:] = pos[:-1]
+    held = (pos != 0) | (prev != 0)
+    tid = np.cumsum((pos != 0) & (prev == 0), axis=0)
+    n_trades = tid[-1]
+    width = int(n_trades.max()) + 1
+    flat = (tid + np.arange(pos.shape[1]) * width)[held]
+    logr = np.bincount(flat, weights=np.log1p(net[held]), minlength=width * pos.shape[1]).reshape(pos.shape[1], width)
+    wins = (logr[:, 1:] > 0).sum(axis=1)
+    return _safe_div(wins.astype("float64"), n_trades.astype("float64"))
+
+@traced()
+def metrics_batch(net, pos=None, freq: int = 252):
+    """metrics()'in (bar x strateji) net getiri matrisi üzerindeki vektörel karşılığı.
+
+    İlk beş KPI her kolonda metrics() ile (CAGR'de son bit farkı dışında) aynıdır; ek olarak Sharpe, Sortino,
+    Calmar, MaxDDDuration (bar), Exposure ve WinRate (trade bazında) döner.
+    ``pos`` verilmezse Exposure ve WinRate NaN olur. DataFrame girdi için
+    strateji başına bir satırlık DataFrame, aksi halde KPI -> dizi sözlüğü döner.
+    """
+    cols = net.columns if isinstance(net, pd.DataFrame) else None
+    r = np.asfortranarray(np.asarray(net, dtype="float64"))
+    if r.ndim == 1:
+        r = r[:, None]
+    n, m = r.shape
+    if n == 0:
+        zero = np.zeros(m)
+        out = {k: zero.copy() for k in ("TotalReturn", "CAGR", "MaxDD", "Vol", "Sharpe", "Sortino", "Calmar", "MaxDDDuration", "Exposure", "WinRate")}
+        out["Days"] = np.zeros(m, dtype=np.int64)
+    else:
+        eq = np.cumprod(1.0 + r, axis=0)
+        total = eq[-1] - 1.0
+        cagr = eq[-1] ** (freq / n) - 1.0
+        maxdd = (eq / np.maximum.accumulate(eq, axis=0) - 1.0).min(axis=0)
+        mean = r.mean(axis=0)
+        std = r.std(axis=0, ddof=1) if n > 1 else np.full(m, np.nan)
+        downside = np.sqrt((np.minimum(r, 0.0) ** 2).mean(axis=0))
+        ann = freq ** 0.5
+        out = {
+            "TotalReturn": total,
+            "CAGR": cagr,
+            "MaxDD": maxdd,
+            "Vol": std * ann,
+            "Days": np.full(m, n, dtype=np.int64),
+            "Sharpe": _safe_div(mean, np.nan_to_num(std)) * ann,
+            "Sortino": _safe_div(mean, downside) * ann,
+            "Calmar": _safe_div(cagr, -maxdd),
+            "MaxDDDuration": _underwater_duration(eq),
+        }
+        if pos is None:
+            out["Exposure"] = np.full(m, np.nan)
+            out["WinRate"] = np.full(m, np.nan)
+        else:
+            p = np.asarray(pos)
+            p = p[:, None] if p.ndim == 1 else p
+            out["Exposure"] = (p != 0).mean(axis=0)
+            out["WinRate"] = _win_rate(r, p)
+    if cols is not None:
+        return pd.DataFrame(out, index=cols)
+    return out
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+from trader.signals.build import build_signals
+from trader.signals.combine import combine
+from trader.backtest.engine import _long_only_positions
+from trader.utils.timing import traced
+
+def price_matrix(df_all: pd.DataFrame, column: str = "close") -> pd.DataFrame:
+    """Uzun formatlı fiyatları (date, symbol) tarih x sembol matrisine çevirir."""
+    return df_all.pivot_table(index="date", columns="symbol", values=column, aggfunc="last").sort_index()
+
+def _ffill(a: np.ndarray) -> np.ndarray:
+    # kolon bazında ileri doldurma (NaN -> son geçerli değer)
+    idx = np.where(np.isnan(a), 0, np.arange(len(a))[:, None])
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    return a[idx, np.arange(a.shape[1])]
+
+def _select(active: np.ndarray, max_positions: int) -> np.ndarray:
+    # slot sayısından fazla aktif sinyal varsa sinyali en önce başlayanlar seçilir
+    n = len(active)
+    prev = np.zeros_like(active)
+    prev[1:] = active[:-1]
+    start = np.maximum.accumulate(np.where(active & ~prev, np.arange(n)[:, None], -1), axis=0)
+    key = np.where(active, start, n)
+    order = np.argsort(key, axis=1, kind="stable")
+    rank = np.empty_like(order)
+    np.put_along_axis(rank, order, np.arange(active.shape[1])[None, :], axis=1)
+    return active & (rank < max_positions)
+
+def target_weights(pos: np.ndarray, max_positions: int | None = None) -> np.ndarray:
+    """Aktif sinyaller arasında eşit ağırlık; max_positions verilirse her slot 1/max_positions."""
+    active = pos.astype(bool)
+    if max_positions is not None:
+        active = _select(active, max_positions)
+        return active / float(max_positions)
+    count = active.sum(axis=1, keepdims=True)
+    return np.divide(active, count, out=np.zeros(active.shape), where=count > 0)
+
+def symbol_positions(prices, entries, exits) -> np.ndarray:
+    """Her sembolün pozisyonu, yalnızca kendi takvimindeki barlarla backtest_long_only'deki gibi.
+
+    Birleşik takvimde fiyatı olmayan (NaN) satırlar sinyalsiz sayılır, pozisyon
+    aynen taşınır; sembolün ilk fiyatlı barındaki sinyaller (tek başına bar 0 gibi)
+    yok sayılır. Henüz fiyat görülmemiş satırlarda pozisyon 0'dır.
+    """
+    P = np.asarray(prices, dtype="float64")
+    valid = ~np.isnan(P)
+    seen = np.maximum.accumulate(valid, axis=0)
+    first = seen.copy()
+    first[1:] &= ~seen[:-1]
+    e = (np.asarray(entries) == 1) & valid & ~first
+    x = (np.asarray(exits) == 1) & valid & ~first
+    return _long_only_positions(e, x) & seen
+
+@traced()
+def backtest_portfolio(prices, entries, exits, max_positions: int | None = None, fee_bps: int = 10, slip_bps: int = 0,
+                       capital: float = 1.0):
+    """Ortak sermaye üzerinde çok sembollü long-only portföy (tarih x sembol matrisleri).
+
+    Her sembolün pozisyonu backtest_long_only kurallarıyla bulunur; hedef ağırlıklar
+    değiştiği barlarda portföy hedefe yeniden dengelenir, arada pozisyonlar fiyatla
+    kayar. Ücret, kaymış ağırlıktan hedefe gerçekten işlem gören tutar üzerinden
+    alınır. Sembolün kendi takviminde olmayan (NaN) barlarda pozisyon fiyatla birlikte
+    olduğu gibi taşınır.
+    Dönüş: (eq, net, weights, turnover); DataFrame girdi için pandas nesneleri.
+    """
+    P = np.asarray(prices, dtype="float64")
+    n, m = P.shape
+    fees = (fee_bps + slip_bps) / 10000.0
+    pos = symbol_positions(P, entries, exits)
+    w = target_weights(pos, max_positions)
+
+    # yeniden dengeleme barları ve her barın bağlı olduğu segment başlangıcı
+    rebal = np.zeros(n, dtype=bool)
+    if n:
+        rebal[0] = w[0].any()
+        rebal[1:] = (w[1:] != w[:-1]).any(axis=1)
+    seg = np.maximum.accumulate(np.where(rebal, np.arange(n), 0))
+    Pv = _ffill(P)
+    W, A = w[seg], Pv[seg]
+
+    def growth(W, A, P):
+        # segment başından bu yana değer oranı: pozisyonlar fiyatla, nakit sabit
+        rel = np.divide(P, A, out=np.ones_like(P), where=W > 0)
+        return (W * rel).sum(axis=1) + (1.0 - W.sum(axis=1))
+
+    G = growth(W, A, Pv)
+    W_prev = np.zeros_like(W)
+    A_prev = Pv.copy()
+    W_prev[1:], A_prev[1:] = W[:-1], A[:-1]
+    G_pre = growth(W_prev, A_prev, Pv)
+    drift = np.divide(W_prev * np.divide(Pv, A_prev, out=np.ones_like(Pv), where=W_prev > 0), G_pre[:, None],
+                      out=np.zeros_like(Pv), where=G_pre[:, None] != 0)
+    turnover = np.where(rebal, np.abs(w - drift).sum(axis=1), 0.0)
+    G_last = np.ones(n)
+    G_last[1:] = G[:-1]
+    net = G_pre / G_last * (1.0 - fees * turnover) - 1.0
+    eq = capital * np.cumprod(1.0 + net)
+    if isinstance(prices, pd.DataFrame):
+        idx, cols = prices.index, prices.columns
+        return (pd.Series(eq, index=idx), pd.Series(net, index=idx), pd.DataFrame(w, index=idx, columns=cols),
+                pd.Series(turnover, index=idx))
+    return eq, net, w, turnover
+
+def signal_matrices(df_all: pd.DataFrame, mode: str = "VOTE", k: int | None = 2, params: dict | None = None):
+    """Her sembolün kendi geçmişinde build_signals + combine; (fiyat, entry, exit) matrisleri."""
+    prices = price_matrix(df_all)
+    ent = pd.DataFrame(0, index=prices.index, columns=prices.columns)
+    ext = pd.DataFrame(0, index=prices.index, columns=prices.columns)
+    for sym, g in df_all.groupby("symbol", sort=True):
+        g = g.sort_values("date").reset_index(drop=True)
+        df2, sig_all = build_signals(g, **(params or {}))
+        e, x = combine(sig_all, mode=mode, k=k, index=df2.index)
+        ent.loc[g["date"].to_numpy(), sym] = e.to_numpy()
+        ext.loc[g["date"].to_numpy(), sym] = x.to_numpy()
+    return prices, ent, ext
@@ -0,0 +1,49 @@
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from trader.signals.combine import pack_signals, subset_mask, combine_packed
+from trader.backtest.engine import backtest_batch, backtest_sides
+from trader.utils.timing import traced
+
+@traced()
+def rank_combos(df: pd.DataFrame, sig_all: dict, fee_bps: int, sides=None, borrow_bps: float = 0.0):
+    """Tüm model kombinasyonu x mod adaylarını toplam getiriye göre sıralar.
+
+    ``sides`` verilirse (ör. ("long", "long_short", "flat")) her aday her yön için
+    aynı batch'te backtest_sides ile çalıştırılır ve sonuca "Side" kolonu eklenir.
+    """
+    all_models = ["OTT", "CCI", "TMA", "RSI"]
+    buy_bits, sell_bits, names = pack_signals({x: sig_all[x] for x in all_models})
+    rows = []
+    specs = []
+    for ksize in range(1, len(all_models) + 1):
+        for combo in combinations(all_models, ksize):
+            mode_specs = [("ANY", None), ("ALL", None)]
+            max_vote = min(3, len(combo))
+            for k_vote in range(2, max_vote + 1):
+                mode_specs.append(("VOTE", k_vote))
+            for mname, kval in mode_specs:
+                label = mname if mname != "VOTE" else f"VOTE {kval}"
+                specs.append((subset_mask(names, combo), mname, kval))
+                rows.append({"Combo": " & ".join(combo), "Mode": label})
+    entries = np.zeros((len(df), len(specs)), dtype=bool)
+    exits = np.zeros((len(df), len(specs)), dtype=bool)
+    for mname in ("ANY", "ALL", "VOTE"):
+        cols = [j for j, spec in enumerate(specs) if spec[1] == mname]
+        masks = [specs[j][0] for j in cols]
+        kvals = [specs[j][2] for j in cols] if mname == "VOTE" else None
+        entries[:, cols], exits[:, cols] = combine_packed(buy_bits, sell_bits, masks, mode=mname, k=kvals)
+    res = pd.DataFrame(rows)
+    if sides is None:
+        eq_b, _, _, trades_b = backtest_batch(df["close"], entries, exits, fee_bps=fee_bps, slip_bps=0)
+    else:
+        side_col = np.repeat(list(sides), len(specs))
+        eq_b, _, _, trades_b = backtest_sides(df["close"], np.tile(entries, len(sides)), np.tile(exits, len(sides)),
+                                              side=side_col, fee_bps=fee_bps, slip_bps=0, borrow_bps=borrow_bps)
+        res = pd.concat([res] * len(sides), ignore_index=True)
+        res["Side"] = side_col
+    res["Trades"] = trades_b.astype(int)
+    res["TotalReturn"] = eq_b[-1] - 1.0 if len(eq_b) else 0.0
+    res = res.sort_values("TotalReturn", ascending=False).reset_index(drop=True)
+    res["TotalReturn(%)"] = (res["TotalReturn"] * 100).round(2)
+    return res[["Combo", "Mode", *(["Side"] if sides is not None else []), "Trades", "TotalReturn", "TotalReturn(%)"]]
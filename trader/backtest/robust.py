@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from trader.signals.combine import pack_signals, subset_mask, combine_packed
+from trader.backtest.engine import backtest_batch
+from trader.backtest.metrics import metrics_batch
+from trader.utils.timing import traced
+
+METHODS = ("bootstrap", "delay", "costs")
+
+def combo_signals(sig_all: dict, combo: str, mode: str):
+    """rank_combos satırındaki ("OTT & TMA", "VOTE 2") gibi etiketlerden entry/exit dizileri."""
+    buy, sell, names = pack_signals(sig_all)
+    parts = mode.split()
+    k = int(parts[1]) if len(parts) > 1 else None
+    return combine_packed(buy, sell, subset_mask(names, [c.strip() for c in combo.split("&")]), mode=parts[0], k=k)
+
+def _block_indices(rng, n: int, size: int, block: int) -> np.ndarray:
+    # hareketli blok bootstrap: her örnek için ardışık blokların başlangıçları rastgele
+    block = max(1, min(block, n))
+    nb = -(-n // block)
+    starts = rng.integers(0, n - block + 1, size=(nb, size))
+    return (starts[:, None, :] + np.arange(block)[None, :, None]).reshape(nb * block, size)[:n]
+
+def _delayed_entries(rng, entry: np.ndarray, size: int, max_delay: int) -> np.ndarray:
+    # her entry olayı bağımsız olarak 0..max_delay bar geciktirilir
+    n = len(entry)
+    ev = np.flatnonzero(entry)
+    out = np.zeros((n, size), dtype=bool)
+    rows = np.minimum(ev[:, None] + rng.integers(0, max_delay + 1, size=(len(ev), size)), n - 1)
+    out[rows, np.broadcast_to(np.arange(size), rows.shape)] = True
+    return out
+
+_STATE = {}
+
+def _init_worker(state: dict):
+    _STATE.update(state)
+
+def _run_batch(method: str, size: int, seed) -> dict:
+    s = _STATE
+    rng = np.random.default_rng(seed)
+    price, entry, exit_ = s["price"], s["entry"], s["exit"]
+    if method == "bootstrap":
+        idx = _block_indices(rng, len(price), size, s["block"])
+        return metrics_batch(s["net"][idx], s["pos"][idx], freq=s["freq"])
+    if method == "delay":
+        e = _delayed_entries(rng, entry, size, s["max_delay"])
+        x = np.broadcast_to(exit_[:, None], e.shape)
+        _, net, pos, _ = backtest_batch(price, e, x, fee_bps=s["fee_bps"], slip_bps=s["slip_bps"])
+        return metrics_batch(net, pos, freq=s["freq"])
+    if method == "costs":
+        lo, hi = s["slip_range"]
+        slip = rng.uniform(lo, hi, size)
+        e = np.broadcast_to(entry[:, None], (len(entry), size))
+        x = np.broadcast_to(exit_[:, None], (len(entry), size))
+        _, net, pos, _ = backtest_batch(price, e, x, fee_bps=s["fee_bps"], slip_bps=slip)
+        return metrics_batch(net, pos, freq=s["freq"])
+    raise ValueError(f"unknown method: {method}")
+
+def summarize(samples: pd.DataFrame, actual: dict | None = None, ci: float = 0.90) -> pd.DataFrame:
+    """Yöntem x KPI başına ortalama, std, medyan ve [lo, hi] güven aralığı."""
+    lo, hi = (1 - ci) / 2, 1 - (1 - ci) / 2
+    kpis = [c for c in samples.columns if c != "method"]
+    g = samples.groupby("method", sort=False)[kpis]
+    out = pd.concat({
+        "mean": g.mean(), "std": g.std(), "p_lo": g.quantile(lo), "median": g.median(), "p_hi": g.quantile(hi),
+    }, axis=1).stack(level=1, future_stack=True).rename_axis(["method", "kpi"])
+    if actual is not None:
+        out.insert(0, "actual", [actual.get(k, np.nan) for _, k in out.index])
+    return out
+
+@traced()
+def robustness(price, entry, exit_, n: int = 1000, methods=METHODS, block: int = 20, max_delay: int = 3,
+               slip_range=(0.0, 20.0), fee_bps: int = 10, slip_bps: int = 0, freq: int = 252, ci: float = 0.90,
+               seed: int = 0, batch: int = 250, workers: int | None = None):
+    """Tek bir sinyal çiftinin (entry/exit) yeniden örneklemeyle dayanıklılık analizi.
+
+    bootstrap: stratejinin net getirileri blok bootstrap ile yeniden dizilir.
+    delay: her entry 0..max_delay bar rastgele geciktirilip yeniden backtest edilir.
+    costs: slip_bps slip_range içinde rastgele seçilip yeniden backtest edilir.
+    Örnekler ``batch`` kolonluk matrisler halinde, process havuzunda hesaplanır.
+    Dönüş: (örnek başına KPI tablosu, güven aralıklı özet).
+    """
+    price = np.asarray(price, dtype="float64")
+    entry = np.asarray(entry) == 1
+    exit_ = np.asarray(exit_) == 1
+    _, net, pos, _ = backtest_batch(price, entry, exit_, fee_bps=fee_bps, slip_bps=slip_bps)
+    actual = {k: v[0] for k, v in metrics_batch(net, pos, freq=freq).items()}
+    state = {"price": price, "entry": entry, "exit": exit_, "net": net[:, 0], "pos": pos[:, 0], "block": block,
+             "max_delay": max_delay, "slip_range": slip_range, "fee_bps": fee_bps, "slip_bps": slip_bps, "freq": freq}
+
+    jobs = [(m, min(batch, n - start)) for m in methods for start in range(0, n, batch)]
+    seeds = np.random.SeedSequence(seed).spawn(len(jobs))
+    workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+    if workers == 1:
+        _init_worker(state)
+        results = [_run_batch(m, size, sd) for (m, size), sd in zip(jobs, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(state,)) as ex:
+            results = list(ex.map(_run_batch, [m for m, _ in jobs], [size for _, size in jobs], seeds))
+    samples = pd.concat([pd.DataFrame(r).assign(method=m) for (m, _), r in zip(jobs, results)], ignore_index=True)
+    return samples, summarize(samples, actual, ci)
@@ -0,0 +1,136 @@
+from itertools import product
+import numpy as np
+import pandas as pd
+from trader.features.graph import FeatureGraph, ma, rsi_node, cci_node, ott_node
+from trader.backtest.engine import backtest_batch
+from trader.backtest.metrics import metrics_batch
+from trader.signals.combine import _threshold
+from trader.utils.timing import traced
+
+DEFAULTS = {
+    "RSI": {"n": [14], "ob": [70], "os": [30]},
+    "CCI": {"n": [20], "upper": [100], "lower": [-100]},
+    "OTT": {"length": [2], "percent": [1.4]},
+    "TMA": {"fast": [5], "mid": [20], "slow": [50]},
+}
+
+def _prev(a: np.ndarray) -> np.ndarray:
+    out = np.empty_like(a)
+    out[:1] = np.nan
+    out[1:] = a[:-1]
+    return out
+
+def _thresholds(values: dict, lows, highs):
+    # values: param -> 1-D series; BUY = low seviyesini yukarı kesme, SELL = high seviyesini aşağı kesme
+    lows = np.asarray(lows, dtype="float64")
+    highs = np.asarray(highs, dtype="float64")
+    buys, sells = [], []
+    for v in values.values():
+        p = _prev(v)[:, None]
+        buys.append((p < lows) & (v[:, None] >= lows))
+        sells.append((p > highs) & (v[:, None] <= highs))
+    return np.hstack(buys), np.hstack(sells)
+
+def _rsi_bank(graph, g, ma_type):
+    ns = list(dict.fromkeys(g["n"]))
+    vals = {n: graph.get(rsi_node(n)).to_numpy(dtype="float64") for n in ns}
+    buy, sell = _thresholds(vals, g["os"], g["ob"])
+    rows = [(n, ob, os_) for n, ob, os_ in product(ns, g["ob"], g["os"])]
+    bi = [ns.index(n) * len(g["os"]) + list(g["os"]).index(os_) for n, _, os_ in rows]
+    si = [ns.index(n) * len(g["ob"]) + list(g["ob"]).index(ob) for n, ob, _ in rows]
+    return pd.DataFrame(rows, columns=["n", "ob", "os"]), buy, sell, bi, si
+
+def _cci_bank(graph, g, ma_type):
+    ns = list(dict.fromkeys(g["n"]))
+    vals = {n: graph.get(cci_node(n)).to_numpy(dtype="float64") for n in ns}
+    buy, sell = _thresholds(vals, g["lower"], g["upper"])
+    rows = [(n, up, lo) for n, up, lo in product(ns, g["upper"], g["lower"])]
+    bi = [ns.index(n) * len(g["lower"]) + list(g["lower"]).index(lo) for n, _, lo in rows]
+    si = [ns.index(n) * len(g["upper"]) + list(g["upper"]).index(up) for n, up, _ in rows]
+    return pd.DataFrame(rows, columns=["n", "upper", "lower"]), buy, sell, bi, si
+
+def _ott_bank(graph, g, ma_type):
+    x = graph.df["close"].to_numpy(dtype="float64")[:, None]
+    xp = _prev(x)
+    pcts = list(dict.fromkeys(g["percent"]))
+    rows, buys, sells = [], [], []
+    for length in dict.fromkeys(g["length"]):
+        o = graph.get(ott_node(length, pcts, ma_type)).to_numpy()
+        op = _prev(o)
+        buys.append((xp <= op) & (x > o))
+        sells.append((xp >= op) & (x < o))
+        rows += [(length, p) for p in pcts]
+    idx = list(range(len(rows)))
+    return pd.DataFrame(rows, columns=["length", "percent"]), np.hstack(buys), np.hstack(sells), idx, idx
+
+def _tma_bank(graph, g, ma_type):
+    spans = list(dict.fromkeys(list(g["fast"]) + list(g["mid"]) + list(g["slow"])))
+    mas = {n: graph.get(ma(n, ma_type)).to_numpy(dtype="float64") for n in spans}
+    rows = list(product(g["fast"], g["mid"], g["slow"]))
+    up = np.column_stack([(mas[f] > mas[m]) & (mas[m] > mas[s]) for f, m, s in rows])
+    dn = np.column_stack([(mas[f] < mas[m]) & (mas[m] < mas[s]) for f, m, s in rows])
+    buy = up.copy()
+    buy[1:] &= ~up[:-1]
+    sell = dn.copy()
+    sell[1:] &= ~dn[:-1]
+    idx = list(range(len(rows)))
+    return pd.DataFrame(rows, columns=["fast", "mid", "slow"]), buy, sell, idx, idx
+
+_BANKS = {"RSI": _rsi_bank, "CCI": _cci_bank, "OTT": _ott_bank, "TMA": _tma_bank}
+
+@traced()
+def build_signal_bank(df: pd.DataFrame, grids: dict, ma_type: str = "EMA", graph: FeatureGraph | None = None) -> dict:
+    """Model başına tekil BUY/SELL kolonları ve parametre noktası -> kolon eşlemesi.
+
+    Her farklı indikatör serisi bir kez hesaplanır; ob/os gibi eşik parametreleri
+    yalnızca aynı seri üzerinde yeniden eşiklenir. Modeller ortak bir FeatureGraph
+    paylaştığından OTT ve TMA'nın aynı MA'ları da tek sefer hesaplanır.
+    """
+    graph = graph or FeatureGraph(df)
+    bank = {}
+    for model, g in grids.items():
+        m = model.upper()
+        full = {**DEFAULTS[m], **{k: list(np.atleast_1d(v)) for k, v in g.items()}}
+        params, buy, sell, bi, si = _BANKS[m](graph, full, ma_type)
+        bank[m] = {"params": params, "buy": buy, "sell": sell, "bi": np.asarray(bi, dtype=np.int64), "si": np.asarray(si, dtype=np.int64)}
+    return bank
+
+@traced()
+def run_sweep(df: pd.DataFrame, bank: dict, mode: str = "ANY", k: int | None = None, fee_bps: int = 10, slip_bps: int = 0,
+              rows: slice = slice(None), chunk: int = 4096, freq: int = 252, stops: dict | None = None) -> pd.DataFrame:
+    """Bank'teki modellerin tüm parametre noktalarının çapraz çarpımını toplu backtest eder.
+
+    ``stops`` (ör. {"stop_loss": 5, "trailing": 3}) backtest_batch'e high/low ile geçirilir.
+    """
+    models = list(bank)
+    sizes = [len(bank[m]["params"]) for m in models]
+    total = int(np.prod(sizes))
+    th = int(_threshold((1 << len(models)) - 1, mode, k))
+    price = df["close"].iloc[rows]
+    if stops:
+        stops = {**stops, **{arg: df[c].iloc[rows] for arg, c in (("high", "high"), ("low", "low"), ("open_", "open")) if c in df}}
+    out = []
+    for start in range(0, total, chunk):
+        flat = np.arange(start, min(start + chunk, total))
+        picks = np.unravel_index(flat, sizes)
+        nb = 0
+        ns = 0
+        for m, pick in zip(models, picks):
+            b = bank[m]
+            nb = nb + b["buy"][rows][:, b["bi"][pick]]
+            ns = ns + b["sell"][rows][:, b["si"][pick]]
+        _, net, pos, trades = backtest_batch(price, nb >= th, ns >= th, fee_bps=fee_bps, slip_bps=slip_bps, **(stops or {}))
+        part = {}
+        for m, pick in zip(models, picks):
+            for col in bank[m]["params"].columns:
+                part[f"{m}_{col}"] = bank[m]["params"][col].to_numpy()[pick]
+        part["Trades"] = trades
+        part.update(metrics_batch(net, pos, freq=freq))
+        out.append(pd.DataFrame(part))
+    res = pd.concat(out, ignore_index=True)
+    return res.sort_values("TotalReturn", ascending=False).reset_index(drop=True)
+
+def sweep(df: pd.DataFrame, grids: dict, mode: str = "ANY", k: int | None = None, fee_bps: int = 10, slip_bps: int = 0,
+          ma_type: str = "EMA", stops: dict | None = None) -> pd.DataFrame:
+    """Örn. sweep(df, {"RSI": {"n": range(5, 30), "ob": [65, 70, 75], "os": [25, 30, 35]}})"""
+    return run_sweep(df, build_signal_bank(df, grids, ma_type), mode=mode, k=k, fee_bps=fee_bps, slip_bps=slip_bps, stops=stops)
@@ -0,0 +1,49 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+from trader.io.store import load_raw, save
+from trader.signals.build import build_signals
+from trader.signals.combine import combine
+from trader.backtest.engine import backtest_long_only
+from trader.backtest.metrics import metrics
+from trader.utils.timing import traced
+
+@traced()
+def run_symbol(symbol: str, df: pd.DataFrame, mode: str = "VOTE", k: int | None = 2, fee_bps: int = 10, slip_bps: int = 0, params: dict | None = None) -> dict:
+    """Tek sembol için sinyal + combine + backtest; metrik satırını döndürür."""
+    df = df.sort_values("date").reset_index(drop=True)
+    df2, sig_all = build_signals(df, **(params or {}))
+    entry, exit_ = combine(sig_all, mode=mode, k=k, index=df2.index)
+    eq, net, pos, trades, buys, sells, open_trades = backtest_long_only(df2, entry, exit_, fee_bps=fee_bps, slip_bps=slip_bps)
+    row = {"symbol": symbol, "start": df2["date"].iloc[0], "end": df2["date"].iloc[-1]}
+    row.update(metrics(eq, net))
+    row.update({"Trades": trades, "Buys": buys, "Sells": sells, "OpenTrades": open_trades})
+    return row
+
+def iter_universe(df_all: pd.DataFrame | None = None, symbols=None, workers: int | None = None, **kwargs):
+    """Sembolleri process havuzunda çalıştırır; her satırı biter bitmez üretir."""
+    df_all = load_raw() if df_all is None else df_all
+    groups = {s: g for s, g in df_all.groupby("symbol", sort=True) if not g.empty}
+    names = [s for s in (symbols or groups) if s in groups]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for s in names:
+            yield run_symbol(s, groups[s], **kwargs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futs = [ex.submit(run_symbol, s, groups[s], **kwargs) for s in names]
+        for f in as_completed(futs):
+            yield f.result()
+
+def run_universe(df_all: pd.DataFrame | None = None, symbols=None, workers: int | None = None, name: str = "universe", on_result=None, **kwargs) -> pd.DataFrame:
+    """Tüm evreni çalıştırıp sonuçları processed/<name>.parquet dosyasına yazar."""
+    rows = []
+    for row in iter_universe(df_all, symbols=symbols, workers=workers, **kwargs):
+        rows.append(row)
+        if on_result is not None:
+            on_result(row)
+    res = pd.DataFrame(rows)
+    if not res.empty:
+        res = res.sort_values("TotalReturn", ascending=False).reset_index(drop=True)
+    save(res, name)
+    return res
@@ -0,0 +1,119 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from trader.backtest.sweep import DEFAULTS, build_signal_bank, run_sweep
+from trader.backtest.engine import backtest_long_only
+from trader.backtest.metrics import metrics
+from trader.signals.combine import _threshold
+from trader.utils.timing import traced
+
+MODELS = ["OTT", "CCI", "TMA", "RSI"]
+
+def make_folds(n: int, train: int, test: int, step: int | None = None, anchored: bool = False) -> list:
+    """Bar indeksleriyle (train, test) slice çiftleri; anchored=True ise train hep 0'dan başlar."""
+    step = step or test
+    out = []
+    start = 0
+    while start + train + test <= n:
+        tr = slice(0 if anchored else start, start + train)
+        out.append((tr, slice(start + train, start + train + test)))
+        start += step
+    return out
+
+def _mode_specs(combo) -> list:
+    # rank_combos ile aynı aday kümesi: ANY, ALL ve VOTE 2..3
+    specs = [("ANY", None), ("ALL", None)]
+    for k in range(2, min(3, len(combo)) + 1):
+        specs.append(("VOTE", k))
+    return specs
+
+def _pick(params: pd.DataFrame, row: pd.Series, prefix: str) -> int:
+    hit = np.ones(len(params), dtype=bool)
+    for col in params.columns:
+        hit &= params[col].to_numpy() == row[f"{prefix}_{col}"]
+    return int(np.flatnonzero(hit)[0])
+
+@traced()
+def optimize(df: pd.DataFrame, bank: dict, rows: slice = slice(None), models=None, fee_bps: int = 10, slip_bps: int = 0,
+             objective: str = "TotalReturn") -> dict:
+    """Verilen satır aralığında model alt kümesi x mod x parametre noktaları arasından en iyisini seçer."""
+    models = [m for m in (models or MODELS) if m in bank]
+    best = None
+    for size in range(1, len(models) + 1):
+        for combo in combinations(models, size):
+            sub = {m: bank[m] for m in combo}
+            for mode, k in _mode_specs(combo):
+                top = run_sweep(df, sub, mode=mode, k=k, fee_bps=fee_bps, slip_bps=slip_bps, rows=rows)
+                top = top.sort_values(objective, ascending=False, kind="mergesort").iloc[0]
+                if best is None or top[objective] > best["score"]:
+                    picks = {m: _pick(bank[m]["params"], top, m) for m in combo}
+                    best = {"combo": combo, "mode": mode, "k": k, "picks": picks, "score": float(top[objective]), "row": top}
+    return best
+
+def signals_for(bank: dict, choice: dict, rows: slice = slice(None)):
+    """Seçilen kombinasyon için entry/exit (0/1) dizileri."""
+    nb = 0
+    ns = 0
+    for m, pick in choice["picks"].items():
+        nb = nb + bank[m]["buy"][rows, bank[m]["bi"][pick]]
+        ns = ns + bank[m]["sell"][rows, bank[m]["si"][pick]]
+    th = int(_threshold((1 << len(choice["combo"])) - 1, choice["mode"], choice["k"]))
+    return (nb >= th).astype(int), (ns >= th).astype(int)
+
+_STATE = {}
+
+def _init_worker(df, bank):
+    _STATE["df"] = df
+    _STATE["bank"] = bank
+
+def _run_fold(i: int, tr: slice, te: slice, fee_bps: int, slip_bps: int, objective: str, models) -> tuple:
+    df, bank = _STATE["df"], _STATE["bank"]
+    choice = optimize(df, bank, rows=tr, models=models, fee_bps=fee_bps, slip_bps=slip_bps, objective=objective)
+    entry, exit_ = signals_for(bank, choice, rows=te)
+    test = df.iloc[te]
+    eq, net, pos, trades, buys, sells, open_trades = backtest_long_only(test, entry, exit_, fee_bps=fee_bps, slip_bps=slip_bps)
+    row = {
+        "fold": i,
+        "train_start": df["date"].iloc[tr.start], "train_end": df["date"].iloc[tr.stop - 1],
+        "test_start": test["date"].iloc[0], "test_end": test["date"].iloc[-1],
+        "Combo": " & ".join(choice["combo"]),
+        "Mode": choice["mode"] if choice["mode"] != "VOTE" else f"VOTE {choice['k']}",
+    }
+    for m, pick in choice["picks"].items():
+        for col, v in bank[m]["params"].iloc[pick].items():
+            row[f"{m}_{col}"] = v
+    row[f"Train{objective}"] = choice["score"]
+    row.update(metrics(eq, net))
+    row["Trades"] = trades
+    return row, net
+
+@traced()
+def walk_forward(df: pd.DataFrame, train: int = 252 * 3, test: int = 252, step: int | None = None, anchored: bool = False,
+                 grids: dict | None = None, models=None, fee_bps: int = 10, slip_bps: int = 0, objective: str = "TotalReturn",
+                 ma_type: str = "EMA", workers: int | None = None):
+    """Train fold'unda model/mod/parametre seçip bir sonraki test fold'unda değerlendirir.
+
+    İndikatörler nedensel olduğundan sinyal bank'i tüm geçmiş üzerinde bir kez
+    hesaplanır ve fold'lar yalnızca satır aralığı ile onu keser; örtüşen
+    pencereler için indikatör yeniden hesaplanmaz. Dönüş: (fold tablosu,
+    birleşik test equity'si, birleşik test net getirisi).
+    """
+    df = df.sort_values("date").reset_index(drop=True)
+    grids = grids or {m: {} for m in DEFAULTS}
+    bank = build_signal_bank(df, grids, ma_type)
+    folds = make_folds(len(df), train, test, step=step, anchored=anchored)
+    args = [(i, tr, te, fee_bps, slip_bps, objective, models) for i, (tr, te) in enumerate(folds)]
+    workers = min(workers or os.cpu_count() or 1, max(len(folds), 1))
+    if workers == 1:
+        _init_worker(df, bank)
+        out = [_run_fold(*a) for a in args]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(df, bank)) as ex:
+            out = list(ex.map(_run_fold, *zip(*args)))
+    res = pd.DataFrame([row for row, _ in out])
+    net = pd.concat([n.set_axis(df["date"].iloc[te]) for (_, n), (_, te) in zip(out, folds)]) if out else pd.Series(dtype="float64")
+    net = net[~net.index.duplicated()]
+    eq = (1.0 + net).cumprod()
+    return res, eq, net
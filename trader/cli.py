@@ -0,0 +1,236 @@
+"""trader komut satırı: fetch, backtest, signals-today, scan, rank, sweep.
+
+Ağır bağımlılıklar (pandas, yfinance, sinyal modülleri) yalnızca seçilen alt
+komutun içinde import edilir; ``trader --help`` ya da önbellekten cevap veren
+``signals-today`` pandas açmadan çalışır.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from trader.config import DEFAULT_START, PRICES_DIR, RAW_PRICES, SIGNALS_DIR
+
+SYMBOLS = ["AAPL", "MSFT", "SPY", "THYAO.IS", "ASELS.IS"]
+TODAY_COLUMNS = ["date", "close", "rsi", "rsi_buy", "rsi_sell", "cci", "cci_buy", "cci_sell",
+                 "ott", "ott_buy", "ott_sell", "tma_buy", "tma_sell"]
+
+def _load(symbol: str, columns=None):
+    from trader.io.store import load_symbol
+    df = load_symbol(symbol, columns=columns)
+    if df.empty:
+        print("No data for", symbol)
+    return df
+
+def cmd_fetch(args) -> int:
+    from trader.datasources.yfinance_source import fetch_many, save_raw
+    df = fetch_many(args.symbols or SYMBOLS, start=args.start, interval=args.interval, workers=args.workers)
+    save_raw(df)
+    for sym, err in df.attrs["failed"].items():
+        print("failed:", sym, err)
+    print(df.head())
+    return 1 if df.empty else 0
+
+def cmd_backtest(args) -> int:
+    df = _load(args.symbol)
+    if df.empty:
+        return 1
+    import pandas as pd
+    from trader.io.signal_store import load_signals
+    from trader.signals.combine import combine
+    from trader.backtest.engine import backtest_long_only, backtest_long_short
+    from trader.backtest.metrics import metrics
+    df, signals = load_signals(args.symbol, df)
+    entry, exit_ = combine(signals, mode=args.mode, k=args.k)
+    if args.side == "long":
+        eq, net, pos, trades, buys, sells, open_trades = backtest_long_only(
+            df, entry, exit_, fee_bps=args.fee_bps, slip_bps=args.slip_bps, **_stops(args)
+        )
+    else:
+        if _stops(args):
+            print("stop/take-profit/trailing/max-hold yalnızca --side long ile destekleniyor")
+            return 2
+        eq, net, pos, trades, buys, sells, open_trades = backtest_long_short(
+            df, entry, exit_, side=args.side, fee_bps=args.fee_bps, slip_bps=args.slip_bps, borrow_bps=args.borrow_bps
+        )
+    print(pd.Series(metrics(eq, net)).round(4))
+    print(f"trades={trades}, buys={buys}, sells={sells}, open_trades={open_trades}")
+    print(eq.tail(5))
+    return 0
+
+def _stops(args) -> dict:
+    return {k: getattr(args, k) for k in ("stop_loss", "take_profit", "trailing", "max_hold") if getattr(args, k) is not None}
+
+def _bars(v: str) -> int:
+    n = int(v)
+    if n < 1:
+        raise argparse.ArgumentTypeError("en az 1 bar olmalı")
+    return n
+
+def _raw_stamp(symbol: str) -> list:
+    # load_symbol'ün okuyacağı dosyaların ad/boyut/mtime listesi: pandas açmadan tazelik kontrolü
+    if (Path(PRICES_DIR) / "_index.parquet").exists():
+        d = Path(PRICES_DIR) / symbol
+        files = sorted(d.glob("*.parquet")) if d.exists() else []
+    else:
+        files = [Path(RAW_PRICES)] if Path(RAW_PRICES).exists() else []
+    return [[f.name, st.st_size, st.st_mtime_ns] for f in files for st in [f.stat()]]
+
+def cmd_signals_today(args) -> int:
+    path = Path(SIGNALS_DIR) / args.symbol / "today.json"
+    stamp = _raw_stamp(args.symbol)
+    if path.exists() and not args.refresh:
+        cached = json.loads(path.read_text())
+        if cached["stamp"] == stamp:
+            print(cached["text"])
+            return 0
+
+    import warnings
+    import pandas as pd
+    from trader.io.signal_store import signal_frame
+    df = _load(args.symbol, columns=["date", "high", "low", "close"])
+    if df.empty:
+        return 1
+    # pandas uyarıları yalnızca hesap süresince susturulur
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        out = pd.concat([df[["date", "close"]], signal_frame(args.symbol, df)], axis=1)
+    out["rsi"] = out["rsi"].round(2)
+    out["cci"] = out["cci"].round(2)
+    out["ott"] = out["ott"].round(4)
+    text = f"{out[TODAY_COLUMNS].tail(5)}\n\nTODAY:\n{out.iloc[-1][TODAY_COLUMNS]}"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps({"stamp": stamp, "text": text}))
+    tmp.replace(path)
+    print(text)
+    return 0
+
+def cmd_scan(args) -> int:
+    import pandas as pd
+    from trader.io.store import save
+    from trader.signals.scan import scan_universe
+    res = scan_universe(symbols=args.symbols or None, warmup=args.warmup or None, fresh_only=not args.all)
+    save(res, "scan")
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(res.head(args.top).round(4).to_string())
+    return 0
+
+def cmd_rank(args) -> int:
+    df = _load(args.symbol)
+    if df.empty:
+        return 1
+    from trader.io.signal_store import load_signals
+    from trader.backtest.rank import rank_combos
+    df2, sig_all = load_signals(args.symbol, df)
+    sides = args.sides.split(",") if args.sides else None
+    res = rank_combos(df2, sig_all, fee_bps=args.fee_bps, sides=sides, borrow_bps=args.borrow_bps)
+    print(res.head(args.top).to_string())
+    return 0
+
+def cmd_sweep(args) -> int:
+    df = _load(args.symbol)
+    if df.empty:
+        return 1
+    from trader.backtest.sweep import DEFAULTS, sweep
+    grids = json.loads(args.grids) if args.grids else {m: {} for m in DEFAULTS}
+    res = sweep(df, grids, mode=args.mode, k=args.k, fee_bps=args.fee_bps, slip_bps=args.slip_bps, stops=_stops(args))
+    print(res.head(args.top).round(4).to_string())
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="trader", description=__doc__.splitlines()[0])
+    p.add_argument("--profile-import", action="store_true", help="alt komutu -X importtime ile çalıştırıp import maliyetini raporla")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    s = sub.add_parser("fetch", help="yfinance'ten barları indirip depoya ekle")
+    s.add_argument("symbols", nargs="*")
+    s.add_argument("--start", default=DEFAULT_START)
+    s.add_argument("--interval", default="1d")
+    s.add_argument("--workers", type=int, default=8)
+    s.set_defaults(fn=cmd_fetch)
+
+    def common(s, mode="VOTE", k=2):
+        s.add_argument("symbol", nargs="?", default="AAPL")
+        s.add_argument("--mode", default=mode)
+        s.add_argument("--k", type=int, default=k)
+        s.add_argument("--fee-bps", type=int, default=10)
+        s.add_argument("--slip-bps", type=int, default=0)
+        s.add_argument("--stop-loss", type=float, default=None, help="giriş fiyatına göre %%")
+        s.add_argument("--take-profit", type=float, default=None, help="giriş fiyatına göre %%")
+        s.add_argument("--trailing", type=float, default=None, help="işlem içi en yüksekten %%")
+        s.add_argument("--max-hold", type=_bars, default=None, help="en fazla tutulacak bar sayısı (>= 1)")
+
+    s = sub.add_parser("backtest", help="kombine sinyallerle long-only / long-short backtest")
+    common(s)
+    s.add_argument("--side", default="long", choices=["long", "long_short", "flat"],
+                   help="long_short: al/sat pozisyonu +1/-1 arasında çevirir; flat: önce kapatır, sonra ters yöne açar")
+    s.add_argument("--borrow-bps", type=float, default=0.0, help="açığa satışta yıllık ödünç maliyeti")
+    s.set_defaults(fn=cmd_backtest)
+
+    s = sub.add_parser("signals-today", help="son barların indikatör ve BUY/SELL durumu")
+    s.add_argument("symbol", nargs="?", default="AAPL")
+    s.add_argument("--refresh", action="store_true", help="önbelleğe bakmadan yeniden hesapla")
+    s.set_defaults(fn=cmd_signals_today)
+
+    s = sub.add_parser("scan", help="tüm semboller için son barın sinyalleri, sıralı tablo")
+    s.add_argument("symbols", nargs="*")
+    s.add_argument("--warmup", type=int, default=500, help="sembol başına kullanılacak son bar sayısı (0: tüm geçmiş)")
+    s.add_argument("--all", action="store_true", help="sinyali olmayan sembolleri de göster")
+    s.add_argument("--top", type=int, default=50)
+    s.set_defaults(fn=cmd_scan)
+
+    s = sub.add_parser("rank", help="model kombinasyonlarını getiriye göre sırala")
+    s.add_argument("symbol", nargs="?", default="AAPL")
+    s.add_argument("--fee-bps", type=int, default=10)
+    s.add_argument("--top", type=int, default=10)
+    s.add_argument("--sides", default=None, help="virgülle ayrılmış yönler, ör. long,long_short,flat")
+    s.add_argument("--borrow-bps", type=float, default=0.0, help="açığa satışta yıllık ödünç maliyeti")
+    s.set_defaults(fn=cmd_rank)
+
+    s = sub.add_parser("sweep", help="parametre ızgarası taraması")
+    common(s, mode="ANY", k=None)
+    s.add_argument("--grids", default=None, help='JSON, ör. \'{"RSI": {"n": [7, 14, 21]}}\'')
+    s.add_argument("--top", type=int, default=10)
+    s.set_defaults(fn=cmd_sweep)
+    # alt komuttan sonra da yazılabilsin; SUPPRESS üst düzeydeki değeri ezmez
+    for s in sub.choices.values():
+        s.add_argument("--profile-import", action="store_true", default=argparse.SUPPRESS, help=argparse.SUPPRESS)
+    return p
+
+def profile_imports(argv: list, top: int = 15) -> int:
+    """Komutu ``python -X importtime`` ile ayrı süreçte çalıştırır; en pahalı üst düzey importları yazar."""
+    import subprocess
+    root = str(Path(__file__).resolve().parents[1])
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")]))}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-m", "trader", *argv], stderr=subprocess.PIPE, text=True, env=env)
+    rows, other = [], []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            other.append(line)
+            continue
+        if "cumulative" in line:
+            continue
+        head, cum, name = line.split("|", 2)
+        rows.append((name[1:], int(head.split(":")[1]), int(cum)))
+    if other:
+        print("\n".join(other), file=sys.stderr)
+    # girinti seviyesi 0 olanlar (ör. "pandas") alt importlarını da kapsar
+    roots = [(n.strip(), c) for n, _, c in rows if not n.startswith(" ")]
+    total = sum(s for _, s, _ in rows)
+    print(f"\nimport time: {total / 1e3:.1f} ms total, {len(rows)} modules", file=sys.stderr)
+    for name, cum in sorted(roots, key=lambda r: -r[1])[:top]:
+        print(f"  {cum / 1e3:8.1f} ms  {name}", file=sys.stderr)
+    return proc.returncode
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args = build_parser().parse_args(argv)
+    if args.profile_import:
+        return profile_imports([a for a in argv if a != "--profile-import"])
+    from trader.utils.timing import script_trace
+    with script_trace():
+        return args.fn(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
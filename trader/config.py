@@ -1,4 +1,17 @@
+import os
+
 DATA_DIR = "data"
 RAW_DIR = "data/raw"
+# depodaki tohum dosya; ilk ingest onu PRICES_DIR altındaki (git dışı) sembol deposuna kopyalar
+RAW_PRICES = "data/raw/prices.parquet"
+PRICES_DIR = "data/raw/prices"
 PROC_DIR = "data/processed"
-DEFAULT_START = "2015-01-01"
\ No newline at end of file
+DEFAULT_START = "2015-01-01"
+FETCH_CACHE_DIR = "data/cache/yfinance"
+# off | record | auto | replay  (replay: yalnızca diskteki yanıtlar, ağ yok)
+# record/auto yanıt başına dosya yazar ve temizlenmez; yalnızca test/replay kaydı için açın
+FETCH_CACHE = os.environ.get("TRADER_FETCH_CACHE", "off")
+INTRADAY_DIR = "data/raw/intraday"
+SIGNALS_DIR = "data/processed/signals"
+# grafik başına en fazla nokta (LTTB ile seyreltme)
+CHART_POINTS = int(os.environ.get("TRADER_CHART_POINTS", "1500"))
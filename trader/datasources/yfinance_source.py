@@ -1,29 +1,101 @@
 # trader/datasources/yfinance_source.py
+import hashlib
+import random
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import yfinance as yf
 import pandas as pd
-from pathlib import Path
-from trader.config import RAW_DIR, DEFAULT_START
-import warnings
-warnings.simplefilter("ignore")
-
-def _normalize_multi(df):
-    if isinstance(df.columns, pd.MultiIndex):
-        df = df.stack(level=-1)                     # (date, ticker) index
-        df = df.rename_axis(index=["date", "symbol"]).reset_index()
-        df.columns = [c.lower() if isinstance(c, str) else c for c in df.columns]
-        return df
+from yfinance.exceptions import YFPricesMissingError, YFTickerMissingError, YFTzMissingError
+from trader.config import DEFAULT_START, FETCH_CACHE, FETCH_CACHE_DIR
+from trader.io.store import append_bars, PRICE_COLUMNS
+from trader.utils.timing import traced
+
+# sembolde veri yok demek; tekrar denemenin anlamı yok
+_NO_DATA = (YFPricesMissingError, YFTickerMissingError, YFTzMissingError)
+
+def _empty() -> pd.DataFrame:
+    return pd.DataFrame({c: pd.Series(dtype="datetime64[ns]" if c == "date" else "object" if c == "symbol" else "float64") for c in PRICE_COLUMNS})
+
+def _normalize_one(raw: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    if raw is None or raw.empty:
+        return _empty()
+    if raw.index.tz is not None:                    # yf.download(ignore_tz=True) ile aynı
+        raw = raw.tz_localize(None)
+    df = raw.rename(columns=str.lower).rename_axis("date").reset_index()
+    df["symbol"] = symbol
+    return df[PRICE_COLUMNS]
+
+def _cache_path(symbol: str, start, end, interval: str, adjust: bool) -> Path:
+    key = hashlib.blake2b(repr((symbol, str(start), str(end), interval, bool(adjust))).encode(), digest_size=8).hexdigest()
+    return Path(FETCH_CACHE_DIR) / f"{symbol}_{key}.parquet"
+
+def _download(symbol: str, start, end, interval: str, adjust: bool, retries: int, backoff: float) -> pd.DataFrame:
+    for attempt in range(retries + 1):
+        try:
+            raw = yf.Ticker(symbol).history(start=start, end=end, interval=interval, auto_adjust=adjust,
+                                            actions=False, raise_errors=True)
+            return _normalize_one(raw, symbol)
+        except _NO_DATA:
+            return _empty()
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt * (1 + random.random()))
+
+def fetch_one(symbol: str, start=DEFAULT_START, end=None, interval="1d", adjust=True, retries: int = 3,
+              backoff: float = 1.0, cache: str | None = None) -> pd.DataFrame:
+    """Tek sembolü indirir; cache modu: off | record | auto | replay.
+
+    auto yalnızca ``end`` verilmiş (kapalı) aralıkları diskten sunar; end=None
+    yanıtı her gün değişeceğinden her seferinde indirilir.
+    """
+    cache = cache or FETCH_CACHE
+    path = _cache_path(symbol, start, end, interval, adjust)
+    if cache == "replay" or (cache == "auto" and end is not None and path.exists()):
+        return pd.read_parquet(path) if path.exists() else _empty()
+    df = _download(symbol, start, end, interval, adjust, retries, backoff)
+    if cache != "off" and not df.empty:             # replay'da eksik dosya zaten boş döner
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_parquet(path, index=False)
     return df
 
-def fetch(symbols, start=DEFAULT_START, end=None, interval="1d", adjust=True):
-    df = yf.download(
-        symbols, start=start, end=end, interval=interval,
-        auto_adjust=adjust, progress=False, group_by="column"
-    )
-    df = _normalize_multi(df)                       # MultiIndex -> long
-    if "date" not in df.columns:                   # tek sembolde de tutarlı ol
-        df = df.rename(columns=str.lower).reset_index()
+@traced()
+def fetch_many(symbols, start=DEFAULT_START, end=None, interval="1d", adjust=True, workers: int = 8, retries: int = 3,
+               backoff: float = 1.0, cache: str | None = None) -> pd.DataFrame:
+    """Sembolleri en fazla ``workers`` eşzamanlı istekle indirip store formatında tek uzun frame döndürür.
+
+    Tekrar denemelere rağmen başarısız olan semboller ``df.attrs["failed"]`` içinde raporlanır.
+    """
+    symbols = list(dict.fromkeys([symbols] if isinstance(symbols, str) else symbols))
+    frames, failed = [], {}
+
+    def one(s):
+        return fetch_one(s, start=start, end=end, interval=interval, adjust=adjust, retries=retries, backoff=backoff, cache=cache)
+
+    # yfinance/pandas uyarıları yalnızca indirme süresince susturulur
+    with warnings.catch_warnings(), ThreadPoolExecutor(max_workers=max(1, min(workers, len(symbols)))) as ex:
+        warnings.simplefilter("ignore")
+        futs = {s: ex.submit(one, s) for s in symbols}
+        for s, f in futs.items():
+            try:
+                frames.append(f.result())
+            except Exception as e:
+                failed[s] = repr(e)
+    frames = [f for f in frames if not f.empty]
+    df = pd.concat(frames, ignore_index=True) if frames else _empty()
+    df.attrs["failed"] = failed
     return df
 
+def fetch(symbols, start=DEFAULT_START, end=None, interval="1d", adjust=True):
+    return fetch_many(symbols, start=start, end=end, interval=interval, adjust=adjust)
+
 def save_raw(df, name="prices"):
-    Path(RAW_DIR).mkdir(parents=True, exist_ok=True)
-    df.to_parquet(f"{RAW_DIR}/{name}.parquet")
\ No newline at end of file
+    """Yeni barları fiyat deposuna ekler (tam dosyayı yeniden yazmaz).
+
+    `name` eski çağrılarla uyumluluk için duruyor; depo tek olduğundan kullanılmaz.
+    """
+    if name != "prices":
+        warnings.warn("save_raw(name=...) artık kullanılmıyor; barlar fiyat deposuna eklenir", DeprecationWarning, stacklevel=2)
+    return append_bars(df)
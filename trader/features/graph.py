@@ -0,0 +1,114 @@
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+from trader.features.indicators import ema, sma, rsi_from_delta, typical_price, cci_from_tp
+from trader.signals.ott import _ott_lines
+from trader.utils.cache import cached
+from trader.utils.timing import traced
+
+class Node(NamedTuple):
+    """Graf düğümü: (işlem, girdiler, parametreler). Girdiler kolon adı ya da başka bir Node'dur."""
+    op: str
+    inputs: tuple
+    params: tuple = ()
+
+OPS = {}
+
+def op(name: str):
+    """Yeni bir düğüm işlemini kaydeder; fonksiyon girdileri sırayla, parametreleri isimle alır."""
+    def deco(fn):
+        OPS[name] = fn
+        return fn
+    return deco
+
+def node(name: str, *inputs, **params) -> Node:
+    return Node(name, tuple(inputs), tuple(sorted(params.items())))
+
+@op("ema")
+def _ema(s, n):
+    return ema(s, n)
+
+@op("sma")
+def _sma(s, n):
+    return sma(s, n)
+
+@op("delta")
+def _delta(s):
+    return s.diff()
+
+@op("rsi")
+@cached("graph.rsi")
+def _rsi(d, n):
+    return rsi_from_delta(d, n)
+
+@op("tp")
+def _tp(high, low, close):
+    return typical_price(high, low, close)
+
+@op("cci")
+@cached("graph.cci")
+def _cci(tp, sma_tp, n):
+    return cci_from_tp(tp, sma_tp, n)
+
+@op("ott")
+@cached("graph.ott")
+def _ott(mav, percents):
+    pct = np.asarray(percents, dtype="float64")
+    m = mav.to_numpy(dtype="float64")
+    return pd.DataFrame(_ott_lines(np.repeat(m[:, None], len(pct), axis=1), pct), index=mav.index, columns=list(percents))
+
+# Modellerin kullandığı düğüm kurucuları
+def ma(n: int, ma_type: str = "EMA", source="close") -> Node:
+    return node("sma" if ma_type.upper() == "SMA" else "ema", source, n=n)
+
+def rsi_node(n: int) -> Node:
+    return node("rsi", node("delta", "close"), n=n)
+
+def cci_node(n: int) -> Node:
+    tp = node("tp", "high", "low", "close")
+    return node("cci", tp, node("sma", tp, n=n), n=n)
+
+def ott_node(length: int, percents, ma_type: str = "EMA") -> Node:
+    return node("ott", ma(length, ma_type), percents=tuple(percents))
+
+class FeatureGraph:
+    """Bir DataFrame üzerinde düğümleri bir kez hesaplayıp paylaşan planlayıcı.
+
+    Aynı (işlem, girdi, parametre) üçlüsü hangi modelden istenirse istensin
+    bir kez hesaplanır; ``computed`` ve ``requested`` paylaşımı gösterir. Pahalı
+    düğümler (ema/sma/rsi/cci/ott) ayrıca INDICATOR_CACHE üzerinden graflar arası paylaşılır.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self._memo = {}
+        self.computed = 0
+        self.requested = 0
+
+    def plan(self, nodes) -> list:
+        """İstenen düğümler ve bağımlılıkları, tekilleştirilmiş ve topolojik sırada."""
+        order, seen = [], set(self._memo)
+
+        def visit(n):
+            if isinstance(n, str) or n in seen:
+                return
+            for i in n.inputs:
+                visit(i)
+            seen.add(n)
+            order.append(n)
+        for n in nodes:
+            visit(n)
+        return order
+
+    @traced("graph.compute")
+    def compute(self, nodes) -> list:
+        nodes = list(nodes)
+        self.requested += len(nodes)
+        for n in self.plan(nodes):
+            args = [self.df[i] if isinstance(i, str) else self._memo[i] for i in n.inputs]
+            self._memo[n] = OPS[n.op](*args, **dict(n.params))
+            self.computed += 1
+        return [self._memo[n] for n in nodes]
+
+    def get(self, n: Node):
+        return self.compute([n])[0]
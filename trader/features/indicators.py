@@ -1,21 +1,38 @@
 import pandas as pd
 import numpy as np
+from trader.utils.cache import cached
+from trader.utils.timing import traced
 
+@traced()
+@cached("sma")
 def sma(s, n):
     return s.rolling(n).mean()
 
+@traced()
+@cached("ema")
 def ema(s, n):
     return s.ewm(span=n, adjust=False).mean()
 
-def rsi(close, n=14):
-    d = close.diff()
+def rsi_from_delta(d, n=14):
     up = d.clip(lower=0).ewm(alpha=1/n, adjust=False).mean()
     dn = (-d.clip(upper=0)).ewm(alpha=1/n, adjust=False).mean()
     rs = up / dn.replace(0, np.nan)
     return 100 - (100/(1+rs))
 
-def cci(df, n=20):
-    tp = (df["high"] + df["low"] + df["close"]) / 3
-    sma_tp = tp.rolling(n).mean()
+@traced()
+@cached("rsi")
+def rsi(close, n=14):
+    return rsi_from_delta(close.diff(), n)
+
+def typical_price(high, low, close):
+    return (high + low + close) / 3
+
+def cci_from_tp(tp, sma_tp, n=20):
     md = (tp - sma_tp).abs().rolling(n).mean()
-    return (tp - sma_tp) / (0.015 * md)
\ No newline at end of file
+    return (tp - sma_tp) / (0.015 * md)
+
+@traced()
+@cached("cci")
+def cci(df, n=20):
+    tp = typical_price(df["high"], df["low"], df["close"])
+    return cci_from_tp(tp, tp.rolling(n).mean(), n)
\ No newline at end of file
@@ -0,0 +1,277 @@
+import math
+from collections import deque
+import numpy as np
+
+# Bar bar güncellenen indikatör durumları. Her sınıf pandas'ın batch hesabıyla
+# (ewm(adjust=False), rolling(n).mean()) aynı kayan nokta adımlarını izler;
+# böylece sonuçlar indicators.py / signals/* ile birebir aynıdır.
+
+NAN = float("nan")
+
+def _div(a: float, b: float) -> float:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return float(np.float64(a) / np.float64(b))
+
+class EMAState:
+    """ewm(span=n | alpha=..., adjust=False).mean() için O(1) durum."""
+
+    def __init__(self, n: int | None = None, alpha: float | None = None):
+        com = (n - 1) / 2 if n is not None else (1 - alpha) / alpha
+        self.alpha = 1.0 / (1.0 + com)
+        self.weighted = NAN
+        self.old_wt = 1.0
+
+    def update(self, x: float) -> float:
+        if math.isinf(x):
+            x = NAN
+        obs = x == x
+        if self.weighted == self.weighted:
+            self.old_wt *= 1.0 - self.alpha
+            if obs:
+                if self.weighted != x:
+                    self.weighted = self.old_wt * self.weighted + self.alpha * x
+                    self.weighted /= self.old_wt + self.alpha
+                self.old_wt = 1.0
+        elif obs:
+            self.weighted = x
+        return self.weighted
+
+    def to_dict(self) -> dict:
+        return {"alpha": self.alpha, "weighted": self.weighted, "old_wt": self.old_wt}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "EMAState":
+        obj = cls(alpha=0.5)
+        obj.alpha, obj.weighted, obj.old_wt = d["alpha"], d["weighted"], d["old_wt"]
+        return obj
+
+class RollingMeanState:
+    """rolling(n).mean() için O(1) durum (pandas'ın Kahan toplamlı ekle/çıkar adımları)."""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.window = deque(maxlen=n)
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_ct = 0
+        self.prev_value = NAN
+
+    def _add(self, v: float) -> None:
+        if v == v:
+            self.nobs += 1
+            y = v - self.comp_add
+            t = self.sum_x + y
+            self.comp_add = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, v) < 0:
+                self.neg_ct += 1
+            if v == self.prev_value:
+                self.same_ct += 1
+            else:
+                self.same_ct = 1
+            self.prev_value = v
+
+    def _remove(self, v: float) -> None:
+        if v == v:
+            self.nobs -= 1
+            y = -v - self.comp_remove
+            t = self.sum_x + y
+            self.comp_remove = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, v) < 0:
+                self.neg_ct -= 1
+
+    def update(self, x: float) -> float:
+        if math.isinf(x):
+            x = NAN
+        if self.n == 1:
+            self.__init__(1)
+        elif len(self.window) == self.n:
+            self._remove(self.window[0])
+        self.window.append(x)
+        self._add(x)
+        if self.nobs < self.n or self.nobs == 0:
+            return NAN
+        result = self.sum_x / self.nobs
+        if self.same_ct >= self.nobs:
+            result = self.prev_value
+        elif self.neg_ct == 0 and result < 0:
+            result = 0.0
+        elif self.neg_ct == self.nobs and result > 0:
+            result = 0.0
+        return result
+
+    def to_dict(self) -> dict:
+        d = {k: v for k, v in vars(self).items() if k != "window"}
+        d["window"] = list(self.window)
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RollingMeanState":
+        obj = cls(d["n"])
+        for k, v in d.items():
+            if k != "window":
+                setattr(obj, k, v)
+        obj.window.extend(d["window"])
+        return obj
+
+def _ma_state(n: int, ma_type: str):
+    return RollingMeanState(n) if ma_type.upper() == "SMA" else EMAState(n)
+
+def _ma_from_dict(d: dict):
+    return RollingMeanState.from_dict(d) if "window" in d else EMAState.from_dict(d)
+
+def _cross(prev: float, cur: float, lower: float, upper: float):
+    return int(prev < lower and cur >= lower), int(prev > upper and cur <= upper)
+
+class RSIState:
+    """Wilder RSI (indicators.rsi) ve compute_rsi_signals ile aynı BUY/SELL."""
+
+    def __init__(self, n: int = 14, ob: float = 70, os: float = 30):
+        self.n, self.ob, self.os = n, ob, os
+        self.up = EMAState(alpha=1 / n)
+        self.dn = EMAState(alpha=1 / n)
+        self.prev_close = NAN
+        self.prev_rsi = NAN
+
+    def update(self, close: float):
+        d = close - self.prev_close
+        if d != d:
+            up = dn = NAN
+        else:
+            up = d if d >= 0 else 0.0
+            dn = -(d if d <= 0 else 0.0)
+        u = self.up.update(up)
+        w = self.dn.update(dn)
+        rs = _div(u, NAN if w == 0 else w)
+        r = 100 - _div(100, 1 + rs)
+        buy, sell = _cross(self.prev_rsi, r, self.os, self.ob)
+        self.prev_close, self.prev_rsi = close, r
+        return r, buy, sell
+
+    def to_dict(self) -> dict:
+        return {"n": self.n, "ob": self.ob, "os": self.os, "up": self.up.to_dict(), "dn": self.dn.to_dict(),
+                "prev_close": self.prev_close, "prev_rsi": self.prev_rsi}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "RSIState":
+        obj = cls(d["n"], d["ob"], d["os"])
+        obj.up, obj.dn = EMAState.from_dict(d["up"]), EMAState.from_dict(d["dn"])
+        obj.prev_close, obj.prev_rsi = d["prev_close"], d["prev_rsi"]
+        return obj
+
+class CCIState:
+    """indicators.cci ve compute_cci_signals ile aynı; durum O(n) pencere."""
+
+    def __init__(self, n: int = 20, upper: float = 100, lower: float = -100):
+        self.n, self.upper, self.lower = n, upper, lower
+        self.sma_tp = RollingMeanState(n)
+        self.md = RollingMeanState(n)
+        self.prev_cci = NAN
+
+    def update(self, high: float, low: float, close: float):
+        tp = (high + low + close) / 3
+        s = self.sma_tp.update(tp)
+        md = self.md.update(abs(tp - s))
+        c = _div(tp - s, 0.015 * md)
+        buy, sell = _cross(self.prev_cci, c, self.lower, self.upper)
+        self.prev_cci = c
+        return c, buy, sell
+
+    def to_dict(self) -> dict:
+        return {"n": self.n, "upper": self.upper, "lower": self.lower, "sma_tp": self.sma_tp.to_dict(),
+                "md": self.md.to_dict(), "prev_cci": self.prev_cci}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "CCIState":
+        obj = cls(d["n"], d["upper"], d["lower"])
+        obj.sma_tp, obj.md = RollingMeanState.from_dict(d["sma_tp"]), RollingMeanState.from_dict(d["md"])
+        obj.prev_cci = d["prev_cci"]
+        return obj
+
+class OTTState:
+    """compute_ott + signals_price_vs_ott rekürsiyonu, bar başına O(1)."""
+
+    def __init__(self, length: int = 2, percent: float = 1.4, ma_type: str = "EMA"):
+        self.length, self.percent, self.ma_type = length, percent, ma_type
+        self.ma = _ma_state(length, ma_type)
+        self.long_stop = None
+        self.short_stop = None
+        self.dirv = 1
+        self.prev_close = NAN
+        self.prev_ott = NAN
+        self.mav = NAN
+
+    def update(self, close: float):
+        m = self.mav = self.ma.update(close)
+        fark = m * self.percent * 0.01
+        ls = m - fark
+        ss = m + fark
+        if self.long_stop is None:
+            long_stop, short_stop, d = ls, ss, 1
+        else:
+            lp, sp = self.long_stop, self.short_stop
+            long_stop = max(ls, lp) if m > lp else ls
+            short_stop = min(ss, sp) if m < sp else ss
+            d = self.dirv
+            if d == -1 and m > sp:
+                d = 1
+            elif d == 1 and m < lp:
+                d = -1
+        mt = long_stop if d == 1 else short_stop
+        if m > mt:
+            ott = mt * (200 + self.percent) / 200
+        elif m <= mt:
+            ott = mt * (200 - self.percent) / 200
+        else:
+            ott = NAN
+        buy = int(self.prev_close <= self.prev_ott and close > ott)
+        sell = int(self.prev_close >= self.prev_ott and close < ott)
+        self.long_stop, self.short_stop, self.dirv = long_stop, short_stop, d
+        self.prev_close, self.prev_ott = close, ott
+        return ott, buy, sell
+
+    def to_dict(self) -> dict:
+        d = {k: v for k, v in vars(self).items() if k != "ma"}
+        d["ma"] = self.ma.to_dict()
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "OTTState":
+        obj = cls(d["length"], d["percent"], d["ma_type"])
+        for k, v in d.items():
+            if k != "ma":
+                setattr(obj, k, v)
+        obj.ma = _ma_from_dict(d["ma"])
+        return obj
+
+class TMAState:
+    """compute_tma_series + signals_tma_order (fast > mid > slow sıralaması)."""
+
+    def __init__(self, fast: int = 5, mid: int = 20, slow: int = 50, ma_type: str = "EMA"):
+        self.fast, self.mid, self.slow, self.ma_type = fast, mid, slow, ma_type
+        self.mas = [_ma_state(n, ma_type) for n in (fast, mid, slow)]
+        self.prev_up = False
+        self.prev_dn = False
+
+    def update(self, close: float):
+        mf, mm, ms = (m.update(close) for m in self.mas)
+        up = mf > mm and mm > ms
+        dn = mf < mm and mm < ms
+        buy, sell = int(up and not self.prev_up), int(dn and not self.prev_dn)
+        self.prev_up, self.prev_dn = up, dn
+        return (mf, mm, ms), buy, sell
+
+    def to_dict(self) -> dict:
+        return {"fast": self.fast, "mid": self.mid, "slow": self.slow, "ma_type": self.ma_type,
+                "mas": [m.to_dict() for m in self.mas], "prev_up": self.prev_up, "prev_dn": self.prev_dn}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "TMAState":
+        obj = cls(d["fast"], d["mid"], d["slow"], d["ma_type"])
+        obj.mas = [_ma_from_dict(m) for m in d["mas"]]
+        obj.prev_up, obj.prev_dn = d["prev_up"], d["prev_dn"]
+        return obj
@@ -0,0 +1,72 @@
+import json
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from trader.config import INTRADAY_DIR
+from trader.utils.timing import traced
+
+# kolon -> dosya dtype'ı; date epoch nanosaniye
+COLUMNS = {"date": "int64", "open": "float32", "high": "float32", "low": "float32", "close": "float32", "volume": "int64"}
+
+def _dir(symbol: str, interval: str) -> Path:
+    return Path(INTRADAY_DIR) / interval / symbol
+
+def _meta_path(symbol: str, interval: str) -> Path:
+    return _dir(symbol, interval) / "meta.json"
+
+def intraday_rows(symbol: str, interval: str = "1m") -> int:
+    p = _meta_path(symbol, interval)
+    return json.loads(p.read_text())["rows"] if p.exists() else 0
+
+def intraday_symbols(interval: str = "1m") -> list:
+    root = Path(INTRADAY_DIR) / interval
+    return sorted(p.parent.name for p in root.glob("*/meta.json")) if root.exists() else []
+
+@traced()
+def append_intraday(df: pd.DataFrame, interval: str = "1m") -> int:
+    """Barları sembol başına kolon dosyalarının sonuna ekler; eklenen satır sayısını döndürür.
+
+    Dosyalar yalnızca sona eklenir: son kayıtlı bardan eski ya da ona eşit tarihler atlanır.
+    meta.json'daki satır sayısı esastır; yarım kalmış bir yazım bir sonraki eklemede kesilir.
+    """
+    if df is None or df.empty:
+        return 0
+    added = 0
+    for sym, g in df.groupby("symbol", sort=True):
+        # fiyatı olmayan barlar yazılmaz; eksik open/high/low kapanışla, hacim 0 ile doldurulur
+        g = g[g["close"].notna()].sort_values("date").drop_duplicates(subset=["date"], keep="first")
+        dates = pd.to_datetime(g["date"]).astype("datetime64[ns]").to_numpy().view("int64")
+        d = _dir(sym, interval)
+        d.mkdir(parents=True, exist_ok=True)
+        rows = intraday_rows(sym, interval)
+        if rows:
+            last = np.memmap(d / "date.bin", dtype="int64", mode="r", shape=(rows,))[-1]
+            keep = dates > last
+            g, dates = g[keep], dates[keep]
+        if not len(g):
+            continue
+        for col, dt in COLUMNS.items():
+            path = d / f"{col}.bin"
+            if path.exists():
+                os.truncate(path, rows * np.dtype(dt).itemsize)
+            if col == "date":
+                values = dates
+            else:
+                values = (g[col].fillna(0) if col == "volume" else g[col].fillna(g["close"])).to_numpy().astype(dt)
+            with open(path, "ab") as f:
+                values.tofile(f)
+        rows += len(g)
+        tmp = d / ".meta.json.tmp"
+        tmp.write_text(json.dumps({"symbol": sym, "interval": interval, "rows": rows}))
+        tmp.replace(_meta_path(sym, interval))
+        added += len(g)
+    return added
+
+def open_intraday(symbol: str, interval: str = "1m") -> dict:
+    """Sembolün kolonlarını salt okunur np.memmap olarak açar (RAM'e yüklemez)."""
+    rows = intraday_rows(symbol, interval)
+    d = _dir(symbol, interval)
+    if not rows:
+        return {col: np.empty(0, dtype=dt) for col, dt in COLUMNS.items()}
+    return {col: np.memmap(d / f"{col}.bin", dtype=dt, mode="r", shape=(rows,)) for col, dt in COLUMNS.items()}
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from trader.config import PROC_DIR, SIGNALS_DIR
+from trader.features.graph import FeatureGraph
+from trader.features.online import RSIState, CCIState, OTTState, TMAState
+from trader.signals.build import model_features
+from trader.signals.cci import signals_cci_levels
+from trader.signals.ott import signals_price_vs_ott
+from trader.signals.rsi import signals_rsi_levels
+from trader.signals.tma import signals_tma_order
+from trader.utils.cache import fingerprint
+from trader.utils.timing import traced
+
+PARAMS = {"rsi_n": 14, "rsi_ob": 70, "rsi_os": 30, "cci_n": 20, "cci_up": 100, "cci_lo": -100,
+          "ott_len": 2, "ott_pct": 1.4, "tma_f": 5, "tma_m": 20, "tma_s": 50}
+
+# model -> (parametreleri, saklanan kolonlar)
+MODELS = {
+    "OTT": (("ott_len", "ott_pct"), ["ott", "mavg", "ott_buy", "ott_sell"]),
+    "TMA": (("tma_f", "tma_m", "tma_s"), ["tma_fast", "tma_mid", "tma_slow", "tma_buy", "tma_sell"]),
+    "CCI": (("cci_n", "cci_up", "cci_lo"), ["cci", "cci_buy", "cci_sell"]),
+    "RSI": (("rsi_n", "rsi_ob", "rsi_os"), ["rsi", "rsi_buy", "rsi_sell"]),
+}
+STATES = {"OTT": OTTState, "TMA": TMAState, "CCI": CCIState, "RSI": RSIState}
+RAW_COLUMNS = ["date", "high", "low", "close"]
+# sembol başına en fazla kayıt (model x parametre kombinasyonu)
+MAX_ENTRIES = 32
+
+def _new_state(model: str, p: dict):
+    if model == "OTT":
+        return OTTState(p["ott_len"], p["ott_pct"], "EMA")
+    if model == "TMA":
+        return TMAState(p["tma_f"], p["tma_m"], p["tma_s"], "EMA")
+    if model == "CCI":
+        return CCIState(p["cci_n"], p["cci_up"], p["cci_lo"])
+    return RSIState(p["rsi_n"], p["rsi_ob"], p["rsi_os"])
+
+def _step(model: str, state, high: float, low: float, close: float) -> tuple:
+    if model == "OTT":
+        o, b, s = state.update(close)
+        return o, state.mav, b, s
+    if model == "TMA":
+        (f, m, sl), b, s = state.update(close)
+        return f, m, sl, b, s
+    if model == "CCI":
+        return state.update(high, low, close)
+    return state.update(close)
+
+def _run(model: str, state, raw: pd.DataFrame) -> pd.DataFrame:
+    # online durum bar bar ilerletilir; sonuçlar batch hesapla birebir aynıdır
+    rows = [_step(model, state, h, lo, c) for h, lo, c in zip(raw["high"].tolist(), raw["low"].tolist(), raw["close"].tolist())]
+    return pd.DataFrame(rows, columns=MODELS[model][1])
+
+def _entry(symbol: str, model: str, p: dict) -> Path:
+    # anahtar: yalnızca model parametreleri; kayıt sembolün tüm geçmişini kapsar
+    key = json.dumps({"params": {k: p[k] for k in MODELS[model][0]}}, sort_keys=True)
+    return Path(SIGNALS_DIR) / symbol / f"{model}-{hashlib.blake2b(key.encode(), digest_size=8).hexdigest()}"
+
+def _evict(symbol: str, keep: int = MAX_ENTRIES) -> None:
+    # en son kullanılanlar kalır (okumada json'un mtime'ı güncellenir)
+    metas = [f for m in MODELS for f in (Path(SIGNALS_DIR) / symbol).glob(f"{m}-*.json")]
+    if len(metas) <= keep:
+        return
+    for f in sorted(metas, key=lambda f: f.stat().st_mtime_ns)[:-keep]:
+        f.unlink(missing_ok=True)
+        f.with_suffix(".parquet").unlink(missing_ok=True)
+
+def _read_meta(path: Path) -> dict | None:
+    p = path.with_suffix(".json")
+    return json.loads(p.read_text()) if p.exists() else None
+
+def _write(path: Path, model: str, p: dict, start, part: pd.DataFrame, raw_hash: str, state) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    part.to_parquet(path.with_suffix(".parquet"), index=False)
+    meta = {"model": model, "params": {k: p[k] for k in MODELS[model][0]}, "start": start, "rows": len(part),
+            "hash": raw_hash, "state": None if state is None else state.to_dict()}
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(meta))
+    tmp.replace(path.with_suffix(".json"))
+
+def _compute(df: pd.DataFrame, p: dict, models) -> dict:
+    # yalnızca istenen modellerin düğümleri hesaplanır; sonuçlar build_signals ile aynı
+    graph = FeatureGraph(df)
+    spec = model_features(rsi_n=p["rsi_n"], cci_n=p["cci_n"], ott_len=p["ott_len"], ott_pct=p["ott_pct"],
+                          tma_f=p["tma_f"], tma_m=p["tma_m"], tma_s=p["tma_s"])
+    f = {m: dict(zip(spec[m], graph.compute(spec[m].values()))) for m in models}
+    out = {}
+    if "OTT" in f:
+        ott = f["OTT"]["ott"].iloc[:, 0]
+        b, s = signals_price_vs_ott(pd.DataFrame({"close": df["close"], "ott": ott}))
+        out["OTT"] = [ott, f["OTT"]["mavg"], b, s]
+    if "TMA" in f:
+        fast, mid, slow = f["TMA"]["fast"], f["TMA"]["mid"], f["TMA"]["slow"]
+        out["TMA"] = [fast, mid, slow, *signals_tma_order(fast, mid, slow)]
+    if "CCI" in f:
+        out["CCI"] = [f["CCI"]["cci"], *signals_cci_levels(f["CCI"]["cci"], p["cci_up"], p["cci_lo"])]
+    if "RSI" in f:
+        out["RSI"] = [f["RSI"]["rsi"], *signals_rsi_levels(f["RSI"]["rsi"], p["rsi_ob"], p["rsi_os"])]
+    return {m: pd.DataFrame(dict(zip(MODELS[m][1], cols))).reset_index(drop=True) for m, cols in out.items()}
+
+@traced()
+def signal_frame(symbol: str, df: pd.DataFrame, history: pd.DataFrame | None = None, **params) -> pd.DataFrame:
+    """df'in satırları için indikatör ve BUY/SELL kolonları; data/processed'dan okunur.
+
+    Sinyaller sembolün tüm geçmişi (``history``, verilmezse df) üzerinde hesaplanıp
+    df'in tarihlerine göre kesilir; böylece başlangıç tarihi değişse de aynı kayıt
+    kullanılır. Her model ayrı kayıttır (sembol, model, parametreler). Kayıtlı
+    aralığın ham verisinin özeti tutulur: özet değişmişse yalnızca o model batch olarak
+    yeniden hesaplanır; sona yeni bar eklendiyse online durumdan devam edilerek uzatılır
+    (durum yoksa ilk uzatmada kayıtlı aralık bir kez yeniden oynatılarak kurulur).
+    Sembol başına en çok MAX_ENTRIES kayıt tutulur, en eski kullanılan silinir.
+    """
+    p = {**PARAMS, **params}
+    columns = [c for _, cols in MODELS.values() for c in cols]
+    if df.empty:
+        return pd.DataFrame(columns=columns, index=df.index)
+    rows = None
+    if history is not None:
+        hist_dates = history["date"].to_numpy()
+        rows = np.searchsorted(hist_dates, df["date"].to_numpy())
+        if rows[-1] >= len(hist_dates) or not (hist_dates[rows] == df["date"].to_numpy()).all():
+            rows = None
+    raw = (df if rows is None else history)[RAW_COLUMNS].reset_index(drop=True)
+    start = str(raw["date"].iloc[0])
+    hashes = {}
+
+    def raw_hash(n: int) -> str:
+        if n not in hashes:
+            hashes[n] = fingerprint(raw.iloc[:n])
+        return hashes[n]
+
+    parts, stale = {}, []
+    for model in MODELS:
+        path = _entry(symbol, model, p)
+        meta = _read_meta(path)
+        if meta is None or meta["rows"] > len(raw) or meta["hash"] != raw_hash(meta["rows"]):
+            stale.append(model)
+            continue
+        part = pd.read_parquet(path.with_suffix(".parquet"))
+        if meta["rows"] < len(raw):
+            if meta["state"] is None:
+                # yeniden hesaplanan kayıtların online durumu ilk uzatmada bir kez kurulur
+                state = _new_state(model, p)
+                _run(model, state, raw.iloc[:meta["rows"]])
+            else:
+                state = STATES[model].from_dict(meta["state"])
+            part = pd.concat([part, _run(model, state, raw.iloc[meta["rows"]:])], ignore_index=True)
+            _write(path, model, p, start, part, raw_hash(len(raw)), state)
+        else:
+            os.utime(path.with_suffix(".json"))
+        parts[model] = part
+    if stale:
+        for model, part in _compute(raw, p, stale).items():
+            parts[model] = part
+            _write(_entry(symbol, model, p), model, p, start, part, raw_hash(len(raw)), None)
+        _evict(symbol)
+    out = pd.concat([parts[m] for m in MODELS], axis=1)
+    if rows is not None:
+        out = out.iloc[rows]
+    out.index = df.index
+    return out
+
+def load_signals(symbol: str, df: pd.DataFrame, history: pd.DataFrame | None = None, **params):
+    """build_signals(history, **params) çıktısının df satırlarına kesilmiş hali, kalıcı depodan.
+
+    ``history`` verilmezse build_signals(df, **params) ile aynıdır.
+    """
+    f = signal_frame(symbol, df, history=history, **params)
+    df2 = df.assign(ott=f["ott"], mavg=f["mavg"])
+    return df2, {m: (f[f"{m.lower()}_buy"], f[f"{m.lower()}_sell"]) for m in MODELS}
+
+def clear_signals(symbol: str | None = None) -> None:
+    """Bir sembolün (ya da tüm sembollerin) kayıtlı sinyallerini siler."""
+    path = Path(SIGNALS_DIR) / symbol if symbol else Path(SIGNALS_DIR)
+    if path.exists():
+        shutil.rmtree(path)
+    # eski SignalState dosyaları (data/processed/state/<sembol>.json) artık kullanılmıyor
+    legacy = Path(PROC_DIR) / "state"
+    if symbol:
+        (legacy / f"{symbol}.json").unlink(missing_ok=True)
+    elif legacy.exists():
+        shutil.rmtree(legacy)
@@ -1,12 +1,178 @@
 from pathlib import Path
+import time
 import pandas as pd
-from trader.config import PROC_DIR
+from trader.config import PROC_DIR, RAW_PRICES, PRICES_DIR
+from trader.utils.timing import traced
+
+PRICE_COLUMNS = ["date", "symbol", "close", "high", "low", "open", "volume"]
+ROW_GROUP_SIZE = 64_000
+MAX_DELTAS = 16
 
 def save(df: pd.DataFrame, name: str) -> None:
     """DataFrame'i processed klasörüne parquet olarak kaydet."""
     Path(PROC_DIR).mkdir(parents=True, exist_ok=True)
     df.to_parquet(f"{PROC_DIR}/{name}.parquet")
 
-def load_raw() -> pd.DataFrame:
-    """data/raw/prices.parquet dosyasını oku."""
-    return pd.read_parquet("data/raw/prices.parquet")
\ No newline at end of file
+def has_store() -> bool:
+    """Sembol bazlı bölümlenmiş fiyat deposu var mı?"""
+    return _index_path().exists()
+
+def _index_path() -> Path:
+    return Path(PRICES_DIR) / "_index.parquet"
+
+def _symbol_dir(symbol: str) -> Path:
+    return Path(PRICES_DIR) / symbol
+
+def _date_filters(start=None, end=None) -> list:
+    filters = []
+    if start is not None:
+        filters.append(("date", ">=", pd.Timestamp(start)))
+    if end is not None:
+        filters.append(("date", "<=", pd.Timestamp(end)))
+    return filters
+
+def _finish(df: pd.DataFrame) -> pd.DataFrame:
+    if "date" in df.columns:
+        if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+            df["date"] = pd.to_datetime(df["date"])
+        df = df.sort_values("date", kind="stable")
+    return df.reset_index(drop=True)
+
+def _index_rows(df: pd.DataFrame) -> pd.DataFrame:
+    g = df.groupby("symbol")["date"]
+    return pd.DataFrame({"start": g.min(), "end": g.max(), "rows": g.size()}).rename_axis("symbol").reset_index()
+
+def _write_index(idx: pd.DataFrame) -> None:
+    idx.sort_values("symbol").reset_index(drop=True).to_parquet(_index_path(), index=False)
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    df = df[PRICE_COLUMNS].copy()
+    df["date"] = pd.to_datetime(df["date"]).astype("datetime64[ns]")
+    df["symbol"] = df["symbol"].astype(str)
+    for c in PRICE_COLUMNS[2:]:
+        df[c] = df[c].astype("float64")
+    return df
+
+def _deltas(symbol: str) -> list:
+    return sorted(_symbol_dir(symbol).glob("delta-*.parquet"))
+
+def _write_partition(df_symbol: pd.DataFrame) -> None:
+    d = _symbol_dir(df_symbol["symbol"].iloc[0])
+    d.mkdir(parents=True, exist_ok=True)
+    old = _deltas(df_symbol["symbol"].iloc[0])
+    df_symbol = _normalize(df_symbol).sort_values("date").reset_index(drop=True)
+    tmp = d / ".base.parquet.tmp"
+    df_symbol.to_parquet(tmp, index=False, row_group_size=ROW_GROUP_SIZE)
+    tmp.replace(d / "base.parquet")
+    for f in old:
+        f.unlink()
+
+@traced()
+def build_store(df: pd.DataFrame | None = None) -> pd.DataFrame:
+    """prices.parquet'i (ya da verilen df'i) sembol başına bir bölüme ayırır ve index yazar."""
+    df = pd.read_parquet(RAW_PRICES) if df is None else df
+    df = _finish(df.copy())
+    Path(PRICES_DIR).mkdir(parents=True, exist_ok=True)
+    for _, g in df.groupby("symbol", sort=True):
+        _write_partition(g)
+    idx = _index_rows(df)
+    _write_index(idx)
+    return idx
+
+def _ensure_store() -> None:
+    if not has_store():
+        if Path(RAW_PRICES).exists():
+            build_store()
+        else:
+            Path(PRICES_DIR).mkdir(parents=True, exist_ok=True)
+            _write_index(pd.DataFrame({"symbol": pd.Series(dtype=str), "start": pd.Series(dtype="datetime64[ns]"),
+                                       "end": pd.Series(dtype="datetime64[ns]"), "rows": pd.Series(dtype="int64")}))
+
+def write_symbol(df_symbol: pd.DataFrame) -> None:
+    """Tek sembolün bölümünü yeniden yazar ve index satırını günceller."""
+    _ensure_store()
+    df_symbol = _finish(df_symbol.copy())
+    _write_partition(df_symbol)
+    idx = pd.read_parquet(_index_path())
+    idx = pd.concat([idx[idx["symbol"] != df_symbol["symbol"].iloc[0]], _index_rows(df_symbol)], ignore_index=True)
+    _write_index(idx)
+
+@traced()
+def append_bars(df_new: pd.DataFrame) -> int:
+    """Yeni barları sembol başına küçük delta dosyaları olarak ekler; eklenen satır sayısını döndürür.
+
+    Tekrar eden (date, symbol) satırlarında mevcut veri korunur. Tam geçmiş yeniden
+    yazılmaz; yalnızca yeni barların tarih aralığındaki mevcut tarihler okunur.
+    """
+    if df_new is None or df_new.empty:
+        return 0
+    _ensure_store()
+    df_new = _normalize(df_new).drop_duplicates(subset=["date", "symbol"]).sort_values(["symbol", "date"])
+    idx = pd.read_parquet(_index_path()).set_index("symbol")
+    added = 0
+    for sym, g in df_new.groupby("symbol", sort=True):
+        if sym in idx.index and _symbol_dir(sym).exists():
+            seen = load_symbol(sym, start=g["date"].min(), columns=["date"])["date"]
+            g = g[~g["date"].isin(seen)]
+        if g.empty:
+            continue
+        d = _symbol_dir(sym)
+        d.mkdir(parents=True, exist_ok=True)
+        g.reset_index(drop=True).to_parquet(d / f"delta-{time.time_ns()}.parquet", index=False)
+        if sym in idx.index:
+            idx.loc[sym, "start"] = min(idx.loc[sym, "start"], g["date"].min())
+            idx.loc[sym, "end"] = max(idx.loc[sym, "end"], g["date"].max())
+            idx.loc[sym, "rows"] = int(idx.loc[sym, "rows"]) + len(g)
+        else:
+            idx.loc[sym, ["start", "end", "rows"]] = [g["date"].min(), g["date"].max(), len(g)]
+        added += len(g)
+    _write_index(idx.rename_axis("symbol").reset_index().astype({"rows": "int64"}))
+    for sym in df_new["symbol"].unique():
+        if len(_deltas(sym)) > MAX_DELTAS:
+            compact([sym])
+    return added
+
+@traced()
+def compact(symbols=None) -> None:
+    """Delta dosyalarını sembolün base dosyasıyla birleştirir."""
+    if not has_store():
+        return
+    for sym in symbols or list_symbols():
+        if _deltas(sym):
+            df = load_symbol(sym).drop_duplicates(subset=["date"], keep="first")
+            _write_partition(df)
+
+@traced()
+def symbol_index() -> pd.DataFrame:
+    """Sembol, ilk/son tarih ve satır sayısı tablosu."""
+    if has_store():
+        return pd.read_parquet(_index_path())
+    if not Path(RAW_PRICES).exists():
+        return pd.DataFrame(columns=["symbol", "start", "end", "rows"])
+    return _index_rows(_finish(pd.read_parquet(RAW_PRICES, columns=["symbol", "date"])))
+
+def list_symbols() -> list:
+    return sorted(symbol_index()["symbol"].tolist())
+
+@traced()
+def load_symbol(symbol: str, start=None, end=None, columns=None) -> pd.DataFrame:
+    """Tek sembolü (isteğe bağlı tarih aralığı ve kolonlarla) yalnızca gereken dosyadan okur."""
+    filters = _date_filters(start, end)
+    if has_store():
+        path = _symbol_dir(symbol)
+        if not path.exists():
+            return pd.DataFrame(columns=columns or PRICE_COLUMNS)
+        df = pd.read_parquet(path, columns=columns, filters=filters or None)
+    else:
+        df = pd.read_parquet(RAW_PRICES, columns=columns, filters=[("symbol", "==", symbol)] + filters)
+    return _finish(df)
+
+def load_raw(columns=None) -> pd.DataFrame:
+    """Tüm fiyatları oku: bölümlenmiş depo varsa oradan, yoksa data/raw/prices.parquet."""
+    if has_store():
+        df = pd.read_parquet(PRICES_DIR, columns=columns)
+        if not pd.api.types.is_datetime64_any_dtype(df["date"]):
+            df["date"] = pd.to_datetime(df["date"])
+        # tek kararlı sıralama (önce date sonra symbol,date sıralamasıyla aynı sonuç)
+        return df.sort_values(["symbol", "date"], kind="stable").reset_index(drop=True)
+    return pd.read_parquet(RAW_PRICES, columns=columns)
@@ -0,0 +1,33 @@
+import pandas as pd
+from trader.features.graph import FeatureGraph, ma, rsi_node, cci_node, ott_node
+from trader.signals.rsi import signals_rsi_levels
+from trader.signals.cci import signals_cci_levels
+from trader.signals.ott import signals_price_vs_ott
+from trader.signals.tma import signals_tma_order
+from trader.utils.timing import traced
+
+def model_features(rsi_n=14, cci_n=20, ott_len=2, ott_pct=1.4, tma_f=5, tma_m=20, tma_s=50, ma_type="EMA") -> dict:
+    """Her modelin ihtiyaç duyduğu graf düğümleri; ortak düğümler (ör. aynı EMA) bir kez hesaplanır."""
+    return {
+        "OTT": {"mavg": ma(ott_len, ma_type), "ott": ott_node(ott_len, [ott_pct], ma_type)},
+        "TMA": {"fast": ma(tma_f, ma_type), "mid": ma(tma_m, ma_type), "slow": ma(tma_s, ma_type)},
+        "CCI": {"cci": cci_node(cci_n)},
+        "RSI": {"rsi": rsi_node(rsi_n)},
+    }
+
+@traced()
+def build_signals(df: pd.DataFrame, rsi_n=14, rsi_ob=70, rsi_os=30, cci_n=20, cci_up=100, cci_lo=-100, ott_len=2, ott_pct=1.4, tma_f=5, tma_m=20, tma_s=50,
+                  graph: FeatureGraph | None = None):
+    graph = graph or FeatureGraph(df)
+    spec = model_features(rsi_n=rsi_n, cci_n=cci_n, ott_len=ott_len, ott_pct=ott_pct, tma_f=tma_f, tma_m=tma_m, tma_s=tma_s)
+    nodes = [n for feats in spec.values() for n in feats.values()]
+    values = dict(zip(nodes, graph.compute(nodes)))
+    f = {m: {k: values[n] for k, n in feats.items()} for m, feats in spec.items()}
+
+    df2 = df.assign(ott=f["OTT"]["ott"].iloc[:, 0], mavg=f["OTT"]["mavg"])
+    ob, os = signals_price_vs_ott(df2)
+    tb, ts = signals_tma_order(f["TMA"]["fast"], f["TMA"]["mid"], f["TMA"]["slow"])
+    cb, cs = signals_cci_levels(f["CCI"]["cci"], cci_up, cci_lo)
+    rb, rs = signals_rsi_levels(f["RSI"]["rsi"], rsi_ob, rsi_os)
+    sig_all = {"OTT": (ob, os), "TMA": (tb, ts), "CCI": (cb, cs), "RSI": (rb, rs)}
+    return df2, sig_all
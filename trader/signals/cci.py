@@ -1,8 +1,12 @@
 import pandas as pd
 from trader.features.indicators import cci
 
-def compute_cci_signals(df, n=20, upper=100, lower=-100):
-    c = cci(df, n)
+def signals_cci_levels(c, upper=100, lower=-100):
     buy = (c.shift(1) < lower) & (c >= lower)
     sell = (c.shift(1) > upper) & (c <= upper)
-    return c, buy.astype(int), sell.astype(int)
\ No newline at end of file
+    return buy.astype(int), sell.astype(int)
+
+def compute_cci_signals(df, n=20, upper=100, lower=-100):
+    c = cci(df, n)
+    buy, sell = signals_cci_levels(c, upper, lower)
+    return c, buy, sell
\ No newline at end of file
@@ -1,6 +1,57 @@
 import pandas as pd
 import numpy as np
+from trader.utils.timing import traced
 
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def pack_signals(signals: dict):
+    """Her bar için tek bir buy ve sell bitmask'i üretir; model i -> bit i."""
+    names = list(signals)
+    if len(names) > 16:
+        raise ValueError("at most 16 models can be packed")
+    dt = np.uint8 if len(names) <= 8 else np.uint16
+    n = len(signals[names[0]][0]) if names else 0
+    buy = np.zeros(n, dtype=dt)
+    sell = np.zeros(n, dtype=dt)
+    for bit, name in enumerate(names):
+        b, s = signals[name]
+        buy |= (np.asarray(b) != 0).astype(dt) << dt(bit)
+        sell |= (np.asarray(s) != 0).astype(dt) << dt(bit)
+    return buy, sell, names
+
+def subset_mask(names: list, subset) -> int:
+    return sum(1 << names.index(x) for x in subset)
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    if bits.dtype == np.uint8:
+        return _POPCOUNT[bits]
+    return _POPCOUNT[bits & 0xFF] + _POPCOUNT[bits >> 8]
+
+def _threshold(mask, mode: str, k):
+    m = mode.upper()
+    width = popcount(np.asarray(mask, dtype=np.uint16)).astype(np.int64)
+    if m == "ALL":
+        return width
+    if m == "VOTE":
+        return np.asarray(k, dtype=np.int64) if k is not None else (width + 1) // 2
+    return np.ones_like(width)
+
+@traced()
+def combine_packed(buy_bits: np.ndarray, sell_bits: np.ndarray, mask, mode: str = "ANY", k=None):
+    """Paketlenmiş sinyallerden ANY/ALL/VOTE entry/exit (bool) üretir.
+
+    ``mask`` tek bir model alt kümesi ya da alt küme dizisi olabilir; dizi verilirse
+    sonuç (bar x alt küme) olur ve ``k`` her alt küme için ayrı verilebilir.
+    """
+    mask_arr = np.asarray(mask, dtype=buy_bits.dtype)
+    th = _threshold(mask, mode, k)
+    if mask_arr.ndim:
+        buy_bits, sell_bits = buy_bits[:, None], sell_bits[:, None]
+    entry = popcount(buy_bits & mask_arr) >= th
+    exit_ = popcount(sell_bits & mask_arr) >= th
+    return entry, exit_
+
+@traced()
 def combine(signals: dict, mode: str = "ANY", k: int | None = None, index: pd.Index | None = None):
     m = mode.upper()
     if m == "NONE":
@@ -11,16 +62,10 @@ def combine(signals: dict, mode: str = "ANY", k: int | None = None, index: pd.In
         if len(index) > 0:
             entry.iat[0] = 1
         return entry, exit_
-    b = pd.DataFrame({name: pair[0].astype(int) for name, pair in signals.items()})
-    s = pd.DataFrame({name: pair[1].astype(int) for name, pair in signals.items()})
-    if m == "ALL":
-        entry = (b.sum(axis=1) == b.shape[1]).astype(int)
-        exit_ = (s.sum(axis=1) == s.shape[1]).astype(int)
-    elif m == "VOTE":
-        th = k if k is not None else int(np.ceil(len(signals) / 2))
-        entry = (b.sum(axis=1) >= th).astype(int)
-        exit_ = (s.sum(axis=1) >= th).astype(int)
-    else:
-        entry = (b.sum(axis=1) >= 1).astype(int)
-        exit_ = (s.sum(axis=1) >= 1).astype(int)
-    return entry, exit_
\ No newline at end of file
+    if not signals:
+        idx = index if index is not None else pd.RangeIndex(0)
+        return pd.Series(0, index=idx, dtype=int), pd.Series(0, index=idx, dtype=int)
+    buy, sell, names = pack_signals(signals)
+    e, x = combine_packed(buy, sell, (1 << len(names)) - 1, mode=m, k=k)
+    idx = signals[names[0]][0].index
+    return pd.Series(e.astype(int), index=idx), pd.Series(x.astype(int), index=idx)
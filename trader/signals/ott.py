@@ -1,58 +1,113 @@
 import pandas as pd
 import numpy as np
 from trader.features.indicators import ema, sma
+from trader.utils.cache import cached
+from trader.utils.timing import traced
 
-def compute_ott(df: pd.DataFrame, length: int = 2, percent: float = 1.4, ma_type: str = "EMA") -> pd.Series:
-    """OTT çizgisini hesaplar ve df'e 'ott' kolonunu ekler."""
-    price = df["close"]
-
+def _mav(price: pd.Series, length: int, ma_type: str) -> pd.Series:
     # Basit MA seçimleri (şimdilik EMA/SMA)
     if ma_type.upper() == "SMA":
-        mav = sma(price, length)
-    else:
-        mav = ema(price, length)
+        return sma(price, length)
+    return ema(price, length)
+
+def _stops_1d(mav: list, ls: list, ss: list, d0: int = 1):
+    # Tek kolon için düz float döngüsü; k > 1 için _stops_2d ile aynı kurallar
+    n = len(mav)
+    long_stop = ls[:]
+    short_stop = ss[:]
+    dirv = [1] * n
+    if n:
+        dirv[0] = d0
+    for i in range(1, n):
+        m = mav[i]
+        lp = long_stop[i - 1]
+        sp = short_stop[i - 1]
+        if m > lp:
+            long_stop[i] = max(ls[i], lp)
+        if m < sp:
+            short_stop[i] = min(ss[i], sp)
+        d = dirv[i - 1]
+        if d == -1 and m > sp:
+            dirv[i] = 1
+        elif d == 1 and m < lp:
+            dirv[i] = -1
+        else:
+            dirv[i] = d
+    return (np.array(long_stop)[:, None], np.array(short_stop)[:, None], np.array(dirv, dtype=np.int64)[:, None])
 
+def _stops_2d(mav: np.ndarray, ls: np.ndarray, ss: np.ndarray):
+    # Her adım k kolonda birlikte ilerler
+    long_stop = ls.copy()
+    short_stop = ss.copy()
+    dirv = np.ones(mav.shape, dtype=np.int64)
+    for i in range(1, len(mav)):
+        m = mav[i]
+        lp = long_stop[i - 1]
+        sp = short_stop[i - 1]
+        np.copyto(long_stop[i], np.maximum(ls[i], lp), where=m > lp)
+        np.copyto(short_stop[i], np.minimum(ss[i], sp), where=m < sp)
+        d = dirv[i - 1]
+        dirv[i] = np.where((d == -1) & (m > sp), 1, np.where((d == 1) & (m < lp), -1, d))
+    return long_stop, short_stop, dirv
+
+def _ott_lines(mav: np.ndarray, percent: np.ndarray) -> np.ndarray:
+    """mav (bar x k) ve percent (k,) için OTT çizgilerini (bar x k) hesaplar."""
     fark = mav * percent * 0.01
+    ls = mav - fark
+    ss = mav + fark
 
-    # Long/short stop hesapları
-    long_stop = pd.Series(index=price.index, dtype="float64")
-    short_stop = pd.Series(index=price.index, dtype="float64")
+    # Long/short stop ve yön (trend) rekürsiyonu
+    if mav.shape[1] == 1:
+        long_stop, short_stop, dirv = _stops_1d(mav[:, 0].tolist(), ls[:, 0].tolist(), ss[:, 0].tolist())
+    else:
+        long_stop, short_stop, dirv = _stops_2d(mav, ls, ss)
 
-    for i in range(len(price)):
-        ls = mav.iat[i] - fark.iat[i]
-        ss = mav.iat[i] + fark.iat[i]
-        if i == 0:
-            long_stop.iat[i] = ls
-            short_stop.iat[i] = ss
-        else:
-            long_stop.iat[i] = max(ls, long_stop.iat[i-1]) if mav.iat[i] > long_stop.iat[i-1] else ls
-            short_stop.iat[i] = min(ss, short_stop.iat[i-1]) if mav.iat[i] < short_stop.iat[i-1] else ss
-
-    # Yön (trend) belirleme
-    dirv = pd.Series(1, index=price.index, dtype="int64")
-    for i in range(1, len(price)):
-        if dirv.iat[i-1] == -1 and mav.iat[i] > short_stop.iat[i-1]:
-            dirv.iat[i] = 1
-        elif dirv.iat[i-1] == 1 and mav.iat[i] < long_stop.iat[i-1]:
-            dirv.iat[i] = -1
-        else:
-            dirv.iat[i] = dirv.iat[i-1]
+    return _line(mav, long_stop, short_stop, dirv, percent)
 
+def _line(mav, long_stop, short_stop, dirv, percent):
     # OTT çizgisi
-    mt = pd.Series(index=price.index, dtype="float64")
-    mt[dirv == 1] = long_stop[dirv == 1]
-    mt[dirv == -1] = short_stop[dirv == -1]
-
+    mt = np.where(dirv == 1, long_stop, short_stop)
     ott_up = mt * (200 + percent) / 200
     ott_dn = mt * (200 - percent) / 200
+    return np.where(mav > mt, ott_up, np.where(mav <= mt, ott_dn, np.nan))
+
+def ott_chunk(mav: np.ndarray, percent: float, state: tuple | None = None):
+    """Bir parça mav için OTT çizgisi ve sonraki parçaya taşınacak state.
+
+    state = (mav, long_stop, short_stop, dir) önceki parçanın son barıdır; parçalar
+    sırayla işlendiğinde sonuç tüm seri üzerinde _ott_lines ile aynıdır.
+    """
+    mav = np.asarray(mav, dtype="float64")
+    fark = mav * percent * 0.01
+    ls = (mav - fark).tolist()
+    ss = (mav + fark).tolist()
+    m = mav.tolist()
+    if state is None:
+        long_stop, short_stop, dirv = _stops_1d(m, ls, ss)
+    else:
+        m0, l0, s0, d0 = state
+        long_stop, short_stop, dirv = (a[1:] for a in _stops_1d([m0] + m, [l0] + ls, [s0] + ss, d0))
+    ott = _line(mav[:, None], long_stop, short_stop, dirv, percent)[:, 0]
+    if not len(mav):
+        return ott, state
+    return ott, (m[-1], float(long_stop[-1, 0]), float(short_stop[-1, 0]), int(dirv[-1, 0]))
 
-    ott = pd.Series(index=price.index, dtype="float64")
-    ott[mav > mt] = ott_up[mav > mt]
-    ott[mav <= mt] = ott_dn[mav <= mt]
+@traced()
+@cached("ott")
+def compute_ott(df: pd.DataFrame, length: int = 2, percent: float = 1.4, ma_type: str = "EMA") -> pd.DataFrame:
+    """OTT çizgisini hesaplar; 'ott' ve 'mavg' kolonları eklenmiş bir kopya döndürür."""
+    mav = _mav(df["close"], length, ma_type)
+    ott = _ott_lines(mav.to_numpy(dtype="float64")[:, None], np.array([percent], dtype="float64"))
+    return df.assign(ott=pd.Series(ott[:, 0], index=df.index), mavg=mav)
 
-    df["ott"] = ott
-    df["mavg"] = mav
-    return df
+@traced()
+@cached("ott_grid")
+def compute_ott_grid(close: pd.Series, length: int = 2, percents=(1.4,), ma_type: str = "EMA") -> pd.DataFrame:
+    """Aynı MA üzerinde birden çok percent için OTT; kolonlar percent değerleri."""
+    pct = np.asarray(percents, dtype="float64")
+    mav = _mav(close, length, ma_type).to_numpy(dtype="float64")
+    ott = _ott_lines(np.repeat(mav[:, None], len(pct), axis=1), pct)
+    return pd.DataFrame(ott, index=close.index, columns=list(percents))
 
 def signals_price_vs_ott(df: pd.DataFrame):
     """Price vs OTT: fiyat OTT'yi yukarı kesince BUY, aşağı kesince SELL"""
@@ -60,4 +115,4 @@ def signals_price_vs_ott(df: pd.DataFrame):
     o = df["ott"]
     buy = (x.shift(1) <= o.shift(1)) & (x > o)
     sell = (x.shift(1) >= o.shift(1)) & (x < o)
-    return buy.astype(int), sell.astype(int)
\ No newline at end of file
+    return buy.astype(int), sell.astype(int)
@@ -1,8 +1,12 @@
 import pandas as pd
 from trader.features.indicators import rsi
 
-def compute_rsi_signals(close, n=14, ob=70, os=30):
-    r = rsi(close, n)
+def signals_rsi_levels(r, ob=70, os=30):
     buy = (r.shift(1) < os) & (r >= os)
     sell = (r.shift(1) > ob) & (r <= ob)
-    return r, buy.astype(int), sell.astype(int)
\ No newline at end of file
+    return buy.astype(int), sell.astype(int)
+
+def compute_rsi_signals(close, n=14, ob=70, os=30):
+    r = rsi(close, n)
+    buy, sell = signals_rsi_levels(r, ob, os)
+    return r, buy, sell
\ No newline at end of file
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+from trader.features.graph import FeatureGraph
+from trader.io.store import load_raw
+from trader.signals.build import model_features
+from trader.signals.ott import _ott_lines, signals_price_vs_ott
+from trader.signals.rsi import signals_rsi_levels
+from trader.signals.cci import signals_cci_levels
+from trader.signals.tma import signals_tma_order
+from trader.utils.timing import traced
+
+MODELS = ["OTT", "TMA", "CCI", "RSI"]
+
+def tail_matrices(df_all: pd.DataFrame, columns=("high", "low", "close"), warmup: int | None = 500):
+    """Her sembolün son ``warmup`` barını sağa yaslı (bar x sembol) matrislere dizer.
+
+    Takvimler hizalanmaz: son satır her sembolün kendi son barıdır; kısa geçmişlerin
+    başı NaN kalır (ewm/rolling NaN önekini atlar, sonuç kırpılmış seriyle aynıdır).
+    Dönüş: ({kolon: DataFrame}, son tarihler Series).
+    """
+    codes, symbols = pd.factorize(df_all["symbol"], sort=True)
+    dates = df_all["date"].to_numpy(dtype="datetime64[ns]")
+    order = np.lexsort((dates, codes))
+    codes = codes[order]
+    counts = np.bincount(codes, minlength=len(symbols))
+    # sembol içinde sondan sıra: 0 = son bar
+    back = np.cumsum(counts)[codes] - 1 - np.arange(len(codes))
+    keep = back < warmup if warmup is not None else np.ones(len(codes), dtype=bool)
+    order, codes, back = order[keep], codes[keep], back[keep]
+    rows = int(back.max()) + 1 if len(back) else 0
+    r = rows - 1 - back
+    out = {}
+    for col in columns:
+        a = np.full((rows, len(symbols)), np.nan)
+        a[r, codes] = df_all[col].to_numpy(dtype="float64")[order]
+        out[col] = pd.DataFrame(a, columns=symbols)
+    last = pd.Series(pd.NaT, index=symbols, dtype="datetime64[ns]")
+    last.iloc[codes[back == 0]] = dates[order][back == 0]
+    return out, last
+
+@traced()
+def scan_universe(df_all: pd.DataFrame | None = None, symbols=None, warmup: int | None = 500, fresh_only: bool = True,
+                  rsi_n=14, rsi_ob=70, rsi_os=30, cci_n=20, cci_up=100, cci_lo=-100, ott_len=2, ott_pct=1.4, tma_f=5, tma_m=20, tma_s=50) -> pd.DataFrame:
+    """Tüm semboller için son barın RSI/CCI/OTT/TMA BUY/SELL bayrakları, tek geçişte.
+
+    İndikatörler (bar x sembol) matrisleri üzerinde kolon bazında hesaplanır; her
+    sembol için yalnızca son ``warmup`` bar kullanılır (None: tüm geçmiş, build_signals
+    ile birebir aynı). Tablo BUY sayısı azalan, SELL sayısı artan sırada döner;
+    ``fresh_only`` ise yalnızca son barında sinyal olan semboller kalır.
+    """
+    if df_all is None:
+        df_all = load_raw(columns=["date", "symbol", "high", "low", "close"])
+    if symbols is not None:
+        df_all = df_all[df_all["symbol"].isin(list(symbols))]
+    if df_all.empty:
+        return pd.DataFrame(columns=["symbol", "date", "close", "rsi", "cci", "ott", "buys", "sells"])
+    mats, last = tail_matrices(df_all, warmup=warmup)
+    close = mats["close"]
+
+    graph = FeatureGraph(mats)
+    spec = model_features(rsi_n=rsi_n, cci_n=cci_n, ott_len=ott_len, ott_pct=ott_pct, tma_f=tma_f, tma_m=tma_m, tma_s=tma_s)
+    del spec["OTT"]["ott"]  # ott düğümü tek kolonludur; matris için çizgiler aşağıda
+    nodes = [n for feats in spec.values() for n in feats.values()]
+    f = dict(zip(nodes, graph.compute(nodes)))
+    mav = f[spec["OTT"]["mavg"]]
+    ott = pd.DataFrame(_ott_lines(mav.to_numpy(), np.full(close.shape[1], float(ott_pct))), columns=close.columns)
+    r, c = f[spec["RSI"]["rsi"]], f[spec["CCI"]["cci"]]
+
+    # bayraklar yalnızca son barda gerekir: sinyal kuralları son iki satıra uygulanır
+    last2 = lambda x: x.iloc[-2:]
+    sig = {
+        "OTT": signals_price_vs_ott({"close": last2(close), "ott": last2(ott)}),
+        "TMA": signals_tma_order(*(last2(f[spec["TMA"][k]]) for k in ("fast", "mid", "slow"))),
+        "CCI": signals_cci_levels(last2(c), cci_up, cci_lo),
+        "RSI": signals_rsi_levels(last2(r), rsi_ob, rsi_os),
+    }
+    res = pd.DataFrame({"date": last, "close": close.iloc[-1], "rsi": r.iloc[-1], "cci": c.iloc[-1], "ott": ott.iloc[-1]})
+    for m in MODELS:
+        res[f"{m.lower()}_buy"] = sig[m][0].iloc[-1]
+        res[f"{m.lower()}_sell"] = sig[m][1].iloc[-1]
+    res["buys"] = res[[f"{m.lower()}_buy" for m in MODELS]].sum(axis=1)
+    res["sells"] = res[[f"{m.lower()}_sell" for m in MODELS]].sum(axis=1)
+    if fresh_only:
+        res = res[(res["buys"] > 0) | (res["sells"] > 0)]
+    res = res.rename_axis("symbol").reset_index()
+    return res.sort_values(["buys", "sells", "symbol"], ascending=[False, True, True], kind="stable").reset_index(drop=True)
@@ -0,0 +1,120 @@
+import hashlib
+import inspect
+import threading
+from collections import OrderedDict
+from functools import wraps
+import numpy as np
+import pandas as pd
+
+def _update_array(h, values) -> None:
+    arr = np.asarray(values)
+    if arr.dtype == object:
+        arr = pd.util.hash_array(arr)
+    h.update(str(arr.dtype).encode())
+    h.update(np.ascontiguousarray(arr).tobytes())
+
+def fingerprint(obj) -> str:
+    """Seri/DataFrame içeriğinin (index dahil) kısa özeti."""
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(obj, pd.DataFrame):
+        _update_array(h, obj.index)
+        for name, col in obj.items():
+            h.update(repr(name).encode())
+            _update_array(h, col.to_numpy())
+    elif isinstance(obj, pd.Series):
+        h.update(repr(obj.name).encode())
+        _update_array(h, obj.index)
+        _update_array(h, obj.to_numpy())
+    else:
+        _update_array(h, obj)
+    return h.hexdigest()
+
+def _key_part(v):
+    if isinstance(v, (pd.Series, pd.DataFrame, np.ndarray)):
+        return ("fp", fingerprint(v))
+    if isinstance(v, (list, tuple)):
+        return tuple(_key_part(x) for x in v)
+    return v
+
+def _nbytes(v) -> int:
+    if isinstance(v, pd.DataFrame):
+        return int(v.memory_usage(index=True).sum())
+    if isinstance(v, pd.Series):
+        return int(v.memory_usage(index=True))
+    if isinstance(v, np.ndarray):
+        return int(v.nbytes)
+    if isinstance(v, tuple):
+        return sum(_nbytes(x) for x in v)
+    return 64
+
+def _copy(v):
+    if isinstance(v, (pd.Series, pd.DataFrame, np.ndarray)):
+        return v.copy()
+    if isinstance(v, tuple):
+        return tuple(_copy(x) for x in v)
+    return v
+
+class IndicatorCache:
+    """Boyutu byte olarak sınırlı LRU önbellek; en eski kullanılan kayıt önce atılır."""
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._data = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        if not self.enabled:
+            return compute()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is not None:
+            return _copy(entry[0])
+        # hesap kilit dışında; aynı anahtarı iki thread hesaplarsa ilk eklenen kalır
+        value = compute()
+        size = _nbytes(value)
+        if size <= self.max_bytes:
+            stored = _copy(value)
+            with self._lock:
+                if key not in self._data:
+                    self._data[key] = (stored, size)
+                    self._bytes += size
+                    while self._bytes > self.max_bytes:
+                        _, (_, old) = self._data.popitem(last=False)
+                        self._bytes -= old
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._data), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+INDICATOR_CACHE = IndicatorCache()
+
+def cached(name: str, cache: IndicatorCache = INDICATOR_CACHE):
+    """Fonksiyon sonucunu (name, girdi özeti, parametreler) anahtarıyla önbelleğe alır."""
+    def deco(fn):
+        sig = inspect.signature(fn)
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = sig.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = (name,) + tuple((k, _key_part(v)) for k, v in bound.arguments.items())
+            return cache.get_or_compute(key, lambda: fn(*args, **kwargs))
+        return wrapper
+    return deco
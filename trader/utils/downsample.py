@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+def lttb(x, y, n: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: çizginin görsel şeklini koruyan n noktanın indeksleri.
+
+    İlk ve son nokta hep tutulur; aradaki her kovadan, önceki seçilen nokta ile sonraki
+    kovanın ortalamasıyla en büyük üçgeni oluşturan nokta seçilir.
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    size = len(y)
+    if n >= size or n < 3:
+        return np.arange(size)
+    edges = (np.arange(n - 1) * ((size - 2) / (n - 2))).astype(np.int64) + 1
+    edges[-1] = size - 1
+    out = np.empty(n, dtype=np.int64)
+    out[0], out[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nhi = edges[i + 2] if i + 2 < n - 1 else size
+        xn, yn = x[hi:nhi].mean(), y[hi:nhi].mean()
+        area = np.abs((x[a] - xn) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (yn - y[a]))
+        a = lo + int(np.argmax(np.nan_to_num(area, nan=-1.0)))
+        out[i + 1] = a
+    return out
+
+def minmax(y, n: int) -> np.ndarray:
+    """Her kovadan en düşük ve en yüksek noktanın indeksleri (tepe/dipler kaybolmaz)."""
+    y = np.asarray(y, dtype="float64")
+    size = len(y)
+    if n >= size or n < 4:
+        return np.arange(size)
+    edges = np.linspace(0, size, (n - 2) // 2 + 1).astype(np.int64)
+    out = [0, size - 1]
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        if hi > lo:
+            seg = y[lo:hi]
+            if np.isnan(seg).all():
+                continue
+            out += [lo + int(np.nanargmin(seg)), lo + int(np.nanargmax(seg))]
+    return np.unique(out)
+
+def downsample(df: pd.DataFrame, x_col: str, y_col: str, max_points: int, keep=None, method: str = "lttb") -> pd.DataFrame:
+    """df'i en fazla ~max_points satıra indirir; ``keep`` (bool maske) satırları her zaman kalır."""
+    if max_points is None or len(df) <= max_points:
+        return df
+    keep_idx = np.flatnonzero(np.asarray(keep, dtype=bool)) if keep is not None else np.empty(0, dtype=np.int64)
+    n = max(max_points - len(keep_idx), 4)
+    x = df[x_col]
+    x = x.to_numpy(dtype="datetime64[ns]").view("int64") if pd.api.types.is_datetime64_any_dtype(x) else x.to_numpy()
+    y = df[y_col].to_numpy()
+    if method == "lttb":
+        sel = lttb(x, y, n)
+    elif method == "minmax":
+        sel = minmax(y, n)
+    else:
+        raise ValueError(f"unknown method: {method}")
+    return df.iloc[np.union1d(sel, keep_idx)]
@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+class Tracer:
+    """Aşama başına wall time, çağrı sayısı ve (isteğe bağlı) tracemalloc bellek farkı toplar.
+
+    Kapalıyken stage() paylaşılan bir nullcontext, traced() ise doğrudan çağrıdır.
+    İç içe aşamalarda süre ve tepe bellek dıştaki aşamaya da dahildir.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self, memory: bool = False) -> None:
+        self.enabled = True
+        self.memory = memory
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self) -> None:
+        self.enabled = False
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.memory = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+    def bind(self, memory: bool = False) -> "Tracer":
+        """Bu thread'in aşamalarını yeni bir Tracer'a yönlendirir ve onu döndürür.
+
+        Aynı süreçte eşzamanlı çalışan oturumlar (ör. Streamlit rerun'ları) birbirinin
+        istatistiğine dokunmaz. tracemalloc başlatılmaz/durdurulmaz; bellek yalnızca
+        süreç zaten izleniyorsa (ör. PYTHONTRACEMALLOC=1) ölçülür.
+        """
+        sink = Tracer()
+        sink.enabled = True
+        sink.memory = memory and tracemalloc.is_tracing()
+        self._local.sink = sink
+        return sink
+
+    def unbind(self) -> None:
+        self._local.sink = None
+
+    def active(self) -> bool:
+        return self.enabled or getattr(self._local, "sink", None) is not None
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def _measure(self, name: str):
+        target = getattr(self._local, "sink", None) or self
+        mem = target.memory and tracemalloc.is_tracing()
+        stack = self._stack()
+        if mem:
+            cur, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            tracemalloc.reset_peak()
+            frame = [cur, cur]
+        else:
+            frame = [0, 0]
+        stack.append(frame)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            secs = time.perf_counter() - t0
+            stack.pop()
+            alloc = peak = None
+            if mem:
+                cur, p = tracemalloc.get_traced_memory()
+                top = max(frame[1], p)
+                alloc, peak = cur - frame[0], top - frame[0]
+                if stack:
+                    stack[-1][1] = max(stack[-1][1], top)
+            target._record(name, secs, alloc, peak)
+
+    def _record(self, name: str, secs: float, alloc, peak) -> None:
+        with self._lock:
+            s = self._stats.setdefault(name, {"stage": name, "calls": 0, "seconds": 0.0, "max_seconds": 0.0, "alloc_bytes": None, "peak_bytes": None})
+            s["calls"] += 1
+            s["seconds"] += secs
+            s["max_seconds"] = max(s["max_seconds"], secs)
+            if alloc is not None:
+                s["alloc_bytes"] = (s["alloc_bytes"] or 0) + alloc
+                s["peak_bytes"] = max(s["peak_bytes"] or 0, peak)
+
+    def stage(self, name: str):
+        return self._measure(name) if self.active() else _NULL
+
+    def report(self) -> list:
+        """Toplam süreye göre azalan sırada aşama satırları."""
+        with self._lock:
+            rows = [dict(s) for s in self._stats.values()]
+        return sorted(rows, key=lambda r: r["seconds"], reverse=True)
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"memory": self.memory, "stages": self.report()}, f, indent=2)
+
+_NULL = nullcontext()
+
+TRACER = Tracer()
+
+def stage(name: str):
+    """``with stage("chart"): ...`` — tracer kapalıyken maliyetsiz."""
+    return TRACER.stage(name)
+
+def traced(name: str | None = None):
+    """Fonksiyonun her çağrısını ``name`` (varsayılan: modül.fonksiyon) aşaması olarak kaydeder."""
+    def deco(fn):
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not TRACER.active():
+                return fn(*args, **kwargs)
+            with TRACER._measure(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return deco
+
+@contextmanager
+def script_trace(path: str | None = None, memory: bool | None = None):
+    """Script'lerde: TRADER_TRACE=trace.json verilmişse çalışmayı izleyip JSON olarak yazar.
+
+    TRADER_TRACE_MEMORY=1 tracemalloc ile bellek farklarını da ölçer.
+    """
+    path = path or os.environ.get("TRADER_TRACE")
+    if not path:
+        yield
+        return
+    memory = os.environ.get("TRADER_TRACE_MEMORY") == "1" if memory is None else memory
+    TRACER.reset()
+    TRACER.enable(memory=memory)
+    try:
+        with TRACER.stage("total"):
+            yield
+    finally:
+        TRACER.dump(path)
+        TRACER.disable()